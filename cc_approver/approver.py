@@ -1,5 +1,5 @@
 from __future__ import annotations
-import json, logging
+import asyncio, functools, json, logging, os
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Union
 import dspy
@@ -30,44 +30,150 @@ class ApproverProgram(dspy.Module):
                          tool_input_json=tool_input_json,
                          history_tail=history_tail or "")
 
-def configure_lm(model: str | None = None, temperature: float = DEFAULT_TEMPERATURE,
-                 max_tokens: int = DEFAULT_MAX_TOKENS, extra_body: dict | None = None,
-                 api_base: str | None = None, api_key: str | None = None) -> None:
-    """Configure global DSPy LM. Auto-discovers model from api_base if needed."""
-    if model is None and api_base:
-        from .discovery import discover_model
-        model = "openai/" + discover_model(api_base)
-    elif model is None:
-        model = DEFAULT_MODEL
+@functools.lru_cache(maxsize=8)
+def _build_lm(model: str, temperature: float, max_tokens: int,
+              extra_body_json: str | None,
+              api_base: str | None, api_key: str | None) -> dspy.LM:
     kwargs = dict(temperature=temperature, max_tokens=max_tokens)
     body = {"priority": DEFAULT_PRIORITY}
-    if extra_body is not None:
-        body.update(extra_body)
+    if extra_body_json:
+        body.update(json.loads(extra_body_json))
     kwargs["extra_body"] = body
     if api_base:
         kwargs["api_base"] = api_base
     if api_key:
         kwargs["api_key"] = api_key
-    dspy.configure(lm=dspy.LM(model, **kwargs))
+    return dspy.LM(model, **kwargs)
+
+def get_lm(model: str | None = None, temperature: float = DEFAULT_TEMPERATURE,
+           max_tokens: int = DEFAULT_MAX_TOKENS, extra_body: dict | None = None,
+           api_base: str | None = None, api_key: str | None = None) -> dspy.LM:
+    """Return a cached dspy.LM for this configuration (auto-discovers via api_base)."""
+    if model is None and api_base:
+        from .discovery import discover_model
+        model = "openai/" + discover_model(api_base)
+    elif model is None:
+        model = DEFAULT_MODEL
+    # extra_body can nest dicts/lists (e.g. provider routing), so the
+    # hashable cache key is its canonical JSON rather than a tuple.
+    body_key = json.dumps(extra_body, sort_keys=True) if extra_body else None
+    return _build_lm(model, temperature, max_tokens, body_key,
+                     api_base, api_key)
+
+def configure_lm(model: str | None = None, temperature: float = DEFAULT_TEMPERATURE,
+                 max_tokens: int = DEFAULT_MAX_TOKENS, extra_body: dict | None = None,
+                 api_base: str | None = None, api_key: str | None = None) -> None:
+    """Configure global DSPy LM. Auto-discovers model from api_base if needed."""
+    dspy.configure(lm=get_lm(model, temperature, max_tokens,
+                             extra_body=extra_body,
+                             api_base=api_base, api_key=api_key))
 
 
+# path -> ((st_mtime_ns, st_size), loaded program); predictors are effectively
+# immutable after load, so the cached instance is returned as-is.
+_COMPILED_CACHE: Dict[str, tuple] = {}
+
+def _load_gz_state(prog: ApproverProgram, path: str) -> None:
+    import gzip
+    state = json.loads(gzip.decompress(Path(path).read_bytes()))
+    prog.load_state(state)
+
 def try_load_compiled(paths: List[Union[str, Path]]) -> Optional[ApproverProgram]:
-    """Load first existing compiled program."""
-    prog = ApproverProgram()
+    """Load first existing compiled program, memoized on (mtime, size).
+
+    A pruned `<path>.gz` sibling (written by the optimizer) is preferred
+    over the raw JSON artifact when present.
+    """
     for p in paths:
         q = Path(p).expanduser()
-        if q.exists():
+        for sp in (str(q) + ".gz", str(q)):
+            try:
+                st = os.stat(sp)
+            except OSError:
+                continue
+            sig = (st.st_mtime_ns, st.st_size)
+            cached = _COMPILED_CACHE.get(sp)
+            if cached and cached[0] == sig:
+                return cached[1]
+            prog = ApproverProgram()
             try:
-                prog.load(str(q))
-                return prog
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                logger.debug(f"Failed to load compiled program from {q}: {e}")
+                if sp.endswith(".gz"):
+                    _load_gz_state(prog, sp)
+                else:
+                    prog.load(sp)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.debug(f"Failed to load compiled program from {sp}: {e}")
                 continue
+            _COMPILED_CACHE[sp] = (sig, prog)
+            return prog
     return None
 
-def run_program(program: ApproverProgram,
+@functools.lru_cache(maxsize=1)
+def _default_program() -> dspy.Predict:
+    # A bare predictor: ApproverProgram.forward only delegates to its step,
+    # so uncompiled hook paths skip the extra Module __call__ frame. The
+    # ApproverProgram class stays for compiled artifacts and the optimizer.
+    return dspy.Predict(Approver)
+
+def get_program(paths: List[Union[str, Path]]) -> dspy.Module:
+    """Compiled program if any candidate exists, else the shared default."""
+    return try_load_compiled(paths) or _default_program()
+
+TOOL_INPUT_LIMIT = 8000
+
+def _bounded_dumps(obj: Any, limit: int = TOOL_INPUT_LIMIT) -> str:
+    """Serialize at most `limit` chars; cost scales with the limit, not the input.
+
+    Top-level dict entries are encoded one at a time with oversized string
+    values pre-sliced, so a multi-MB Write payload never gets fully dumped.
+    """
+    if isinstance(obj, dict):
+        parts = []
+        total = 2  # braces
+        for k, v in obj.items():
+            if isinstance(v, str) and len(v) > limit:
+                v = v[:limit]
+            piece = f"{json.dumps(str(k), ensure_ascii=False)}: {json.dumps(v, ensure_ascii=False)}"
+            parts.append(piece)
+            total += len(piece) + 2
+            if total >= limit:
+                break
+        return ("{" + ", ".join(parts) + "}")[:limit]
+    if isinstance(obj, str) and len(obj) > limit:
+        obj = obj[:limit]
+    return json.dumps(obj, ensure_ascii=False)[:limit]
+
+def run_program(program: dspy.Module,
                 policy: str, tool: str, tool_input: Dict[str, Any], 
                 history_tail: str) -> dspy.Prediction:
-    j = json.dumps(tool_input, ensure_ascii=False)[:8000]
+    j = _bounded_dumps(tool_input)
     return program(policy=policy or "", tool=tool or "",
-                   tool_input_json=j, history_tail=history_tail or "")
\ No newline at end of file
+                   tool_input_json=j, history_tail=history_tail or "")
+
+async def run_program_async(program: dspy.Module,
+                            policy: str, tool: str, tool_input: Dict[str, Any],
+                            history_tail: str = "") -> dspy.Prediction:
+    """Async variant of run_program so pending approvals overlap on I/O."""
+    j = _bounded_dumps(tool_input)
+    kwargs = dict(policy=policy or "", tool=tool or "",
+                  tool_input_json=j, history_tail=history_tail or "")
+    acall = getattr(program, "acall", None)
+    if acall is not None:
+        return await acall(**kwargs)
+    return await dspy.asyncify(program)(**kwargs)
+
+def run_program_batch(program: dspy.Module, policy: str,
+                      items: List[Dict[str, Any]]) -> List[dspy.Prediction]:
+    """Run several tool approvals concurrently through the async LM path."""
+    async def _gather():
+        return await asyncio.gather(*(
+            run_program_async(program, policy, it.get("tool") or "",
+                              it.get("tool_input") or {}, it.get("history_tail") or "")
+            for it in items))
+    try:
+        return list(asyncio.run(_gather()))
+    except Exception as e:
+        logger.debug(f"Async batch failed, falling back to sequential: {e}")
+        return [run_program(program, policy, it.get("tool") or "",
+                            it.get("tool_input") or {}, it.get("history_tail") or "")
+                for it in items]
\ No newline at end of file
@@ -1,20 +1,22 @@
 from __future__ import annotations
-import argparse, json, os, sys, logging
+import argparse, functools, json, os, sys, logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 from .settings import (
     load_settings_chain, write_settings, ensure_policy_text, ensure_dspy_config,
     merge_pretooluse_hook, get_policy_text, get_dspy_config, _read_json
 )
-from .optimizer import optimize_from_files
-from . import tui
-
 logger = logging.getLogger(__name__)
 
-def main() -> None:
-    if len(sys.argv) == 1:
-        _tui_entry(); return
+def optimize_from_files(*args, **kwargs):
+    """Lazy proxy so `cc-approver --help`/`init` never import dspy."""
+    from .optimizer import optimize_from_files as _impl
+    return _impl(*args, **kwargs)
 
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    # Memoized: parse_args doesn't mutate the parser, so repeat main()
+    # calls (common in tests) reuse one instance.
     ap = argparse.ArgumentParser(prog="cc-approver", description="DSPy-only approver for Claude Code")
     sub = ap.add_subparsers(dest="cmd", required=True)
 
@@ -28,7 +30,7 @@ def main() -> None:
     p.add_argument("--matcher")
     p.add_argument("--timeout", type=int)
     p.add_argument("--policy-text")
-    p.set_defaults(func=cmd_init_or_tui)
+    p.set_defaults(func="cmd_init_or_tui")
 
     p = sub.add_parser("optimize", help="Train/compile from JSONL labels")
     p.add_argument("--scope", choices=["project","global"])
@@ -42,23 +44,42 @@ def main() -> None:
     p.add_argument("--eval-model")
     p.add_argument("--save")
     p.add_argument("--history-bytes", type=int)
-    p.set_defaults(func=cmd_optimize_or_tui)
+    p.add_argument("--num-threads", type=int)
+    p.set_defaults(func="cmd_optimize_or_tui")
+
+    p = sub.add_parser("learn-rules", help="Mine fast-path rules from JSONL labels")
+    p.add_argument("--train", required=True)
+    p.add_argument("--min-count", type=int, default=3)
+    p.add_argument("--out", help="Rules path (default: .claude/fastpath.json)")
+    p.set_defaults(func="cmd_learn_rules")
 
     p = sub.add_parser("hook", help="Run the PreToolUse hook")
     p.add_argument("--history-bytes", type=int, help="Override settings historyBytes")
     p.add_argument("--verbose", action="store_true", help="Show verbose debug output")
-    p.set_defaults(func=cmd_hook)
+    p.add_argument("--serve", action="store_true",
+                   help="Serve newline-delimited JSON requests on stdin")
+    p.set_defaults(func="cmd_hook")
 
-    args = ap.parse_args()
-    args.func(args)
+    return ap
+
+def main() -> None:
+    if len(sys.argv) == 1:
+        _tui_entry(); return
+
+    args = _build_parser().parse_args()
+    # func holds the handler *name* so the cached parser still sees
+    # monkeypatched handlers (late binding through module globals).
+    globals()[args.func](args)
 
 def _tui_entry() -> None:
+    from . import tui
     act = tui.main_menu()
     if act == "Init": cmd_init_or_tui(argparse.Namespace())
     elif act == "Optimize": cmd_optimize_or_tui(argparse.Namespace())
     else: sys.exit(0)
 
 def cmd_init_or_tui(args: argparse.Namespace) -> None:
+    from . import tui
     need_tui = not all(getattr(args, k, None) is not None for k in
                        ["scope","model","history_bytes","matcher","timeout","policy_text"])
     sel = tui.init_menu() if need_tui else {
@@ -96,6 +117,7 @@ def _run_init(scope, model, history_bytes, matcher, timeout, policy_text,
     print(f"Initialized settings at {path}")
 
 def cmd_optimize_or_tui(args: argparse.Namespace) -> None:
+    from . import tui
     need_tui = not getattr(args, "train", None)
     sel = tui.optimize_menu() if need_tui else {
         "scope": args.scope or "project",
@@ -107,11 +129,12 @@ def cmd_optimize_or_tui(args: argparse.Namespace) -> None:
         "eval_model": args.eval_model,
         "train": args.train, "val": args.val,
         "history_bytes": args.history_bytes if args.history_bytes is not None else 0,
+        "num_threads": args.num_threads if getattr(args, "num_threads", None) else 16,
     }
     _run_optimize(**sel, save=getattr(args, "save", None))
 
 def _run_optimize(scope, optimizer, auto, task_model, prompt_model, reflection_model,
-                  eval_model, train, val, history_bytes, save=None):
+                  eval_model, train, val, history_bytes, num_threads=16, save=None):
     proj = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
     settings, _ = load_settings_chain(proj)
     cfg = get_dspy_config(settings, proj)
@@ -125,19 +148,34 @@ def _run_optimize(scope, optimizer, auto, task_model, prompt_model, reflection_m
     )
     save_path.parent.mkdir(parents=True, exist_ok=True)
 
-    warm = save_path if save_path.exists() else (Path(proj)/".claude/models/approver.compiled.json")
-    warm = warm if isinstance(warm, Path) and warm.exists() else (Path.home()/".claude/models/approver.compiled.json")
+    from .paths import first_existing
+    warm = first_existing([save_path,
+                           Path(proj)/".claude/models/approver.compiled.json",
+                           Path.home()/".claude/models/approver.compiled.json"])
 
     compiled, acc = optimize_from_files(
         task_model=task, train_path=Path(train), val_path=Path(val) if val else None,
         optimizer=optimizer, auto=auto, settings=settings,
         prompt_model=prompt, reflection_model=refl, eval_model=evalm,
-        history_bytes=history_bytes, warm_start=warm if isinstance(warm, Path) and warm.exists() else None,
+        history_bytes=history_bytes, warm_start=warm, num_threads=num_threads,
     )
     compiled.save(str(save_path))
     print(f"Saved compiled program to {save_path}")
+    try:
+        from .optimizer import compress_compiled
+        gz = compress_compiled(save_path, history_bytes)
+        print(f"Wrote pruned artifact {gz}")
+    except (OSError, ValueError) as e:
+        logger.debug(f"Skipping compiled-artifact compression: {e}")
     print(f"Dev accuracy: {acc:.3f}")
 
+def cmd_learn_rules(args: argparse.Namespace) -> None:
+    from .fastpath import learn_rules, rules_path, write_rules
+    rules = learn_rules(Path(args.train), min_count=args.min_count)
+    path = Path(args.out) if args.out else rules_path()
+    write_rules(rules, path)
+    print(f"Wrote {len(rules)} fast-path rules to {path}")
+
 def cmd_hook(args: argparse.Namespace) -> None:
     # Set verbose flag if provided
     if getattr(args, "verbose", False):
@@ -145,5 +183,8 @@ def cmd_hook(args: argparse.Namespace) -> None:
     
     # Call the hook main function
     from . import hook
-    hook.main()
+    if getattr(args, "serve", False):
+        hook.serve_lines()
+    else:
+        hook.main()
 
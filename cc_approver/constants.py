@@ -15,7 +15,9 @@ MAX_REASON_LENGTH = 500
 DEFAULT_HISTORY_BYTES = 0
 
 # Decision Constants
-VALID_DECISIONS = {"allow", "deny", "ask"}
+# frozenset: membership tests sit on hot paths (metrics, label filtering,
+# decision normalization), so lookups must stay O(1).
+VALID_DECISIONS = frozenset({"allow", "deny", "ask"})
 DEFAULT_DECISION = "ask"
 
 # Path Constants
@@ -25,6 +27,7 @@ HOOK_EVENT_NAME = "PreToolUse"
 # Training Constants
 VALIDATION_SPLIT_RATIO = 0.2
 RANDOM_SEED = 7
+EVAL_NUM_THREADS = 16
 
 # Gemini Model Choices
 GEMINI_CHOICES = [
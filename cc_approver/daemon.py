@@ -0,0 +1,145 @@
+"""Long-lived approver daemon: keeps dspy + compiled program warm across hook calls."""
+from __future__ import annotations
+import json, os, sys, logging, queue, socket, socketserver, tempfile, threading, time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DAEMON_ENV = "CC_APPROVER_DAEMON"
+SOCKET_ENV = "CC_APPROVER_SOCKET"
+
+BATCH_WINDOW_S = 0.025
+BATCH_MAX = 8
+
+_program = None  # pre-loaded ApproverProgram, set once in _init_program
+_queue: "queue.Queue[list]" = queue.Queue()  # slots of [payload, result, done-event]
+
+def daemon_enabled() -> bool:
+    return os.environ.get(DAEMON_ENV, "").lower() == "true"
+
+def socket_path() -> str:
+    override = os.environ.get(SOCKET_ENV)
+    if override: return override
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return str(Path(runtime) / "cc-approver.sock")
+
+def _init_program() -> None:
+    """Configure the LM and load the compiled program once, off the request path."""
+    global _program
+    from .approver import ApproverProgram, configure_lm, try_load_compiled
+    from .settings import load_and_merge_settings, get_dspy_config
+    from .paths import compiled_candidates
+    proj = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    settings, _ = load_and_merge_settings(proj)
+    cfg = get_dspy_config(settings, proj)
+    configure_lm(cfg.get("model"), extra_body=cfg.get("extraBody"),
+                 api_base=cfg.get("apiBase"), api_key=cfg.get("apiKey"))
+    _program = try_load_compiled(compiled_candidates(cfg, proj)) or ApproverProgram()
+
+def _submit(payload: dict) -> dict:
+    """Queue a payload for the batch worker and wait for its decision."""
+    slot = [payload, None, threading.Event()]
+    _queue.put(slot)
+    slot[2].wait()
+    return slot[1]
+
+def _drain_batch() -> List[list]:
+    """Block for one request, then gather more arriving within the window."""
+    slots = [_queue.get()]
+    deadline = time.monotonic() + BATCH_WINDOW_S
+    while len(slots) < BATCH_MAX:
+        left = deadline - time.monotonic()
+        if left <= 0: break
+        try:
+            slots.append(_queue.get(timeout=left))
+        except queue.Empty:
+            break
+    return slots
+
+def _fallback_output() -> dict:
+    from .constants import HOOK_EVENT_NAME, DEFAULT_DECISION
+    return {"hookSpecificOutput":{
+        "hookEventName":HOOK_EVENT_NAME,
+        "permissionDecision":DEFAULT_DECISION,
+        "permissionDecisionReason":"approver daemon error"
+    }}
+
+def _batch_worker() -> None:
+    from .hook import decide, decide_batch
+    while True:
+        slots = _drain_batch()
+        try:
+            if len(slots) == 1:
+                slots[0][1] = decide(slots[0][0], program=_program)
+            else:
+                outs = decide_batch([s[0] for s in slots], program=_program)
+                for s, out in zip(slots, outs):
+                    s[1] = out
+        except Exception as e:
+            logger.exception(f"Batch decision failed: {e}")
+            for s in slots:
+                if s[1] is None:
+                    s[1] = _fallback_output()
+        finally:
+            for s in slots:
+                s[2].set()
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        raw = self.rfile.read()
+        try:
+            payload = json.loads(raw) if raw.strip() else {}
+        except json.JSONDecodeError as e:
+            logger.debug(f"Bad payload from client: {e}")
+            payload = {}
+        out = _submit(payload)
+        self.wfile.write(json.dumps(out).encode("utf-8") + b"\n")
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve() -> None:
+    path = socket_path()
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    _init_program()
+    threading.Thread(target=_batch_worker, daemon=True).start()
+    with _Server(path, _Handler) as srv:
+        srv.serve_forever()
+
+def spawn() -> None:
+    """Start a detached daemon process (best effort)."""
+    try:
+        os.posix_spawn(sys.executable,
+                       [sys.executable, "-m", "cc_approver.daemon"],
+                       dict(os.environ), setsid=True)
+    except OSError as e:
+        logger.debug(f"Failed to spawn daemon: {e}")
+
+def request(raw: bytes) -> Optional[bytes]:
+    """Forward a raw hook payload to the daemon; None if it is unreachable."""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.settimeout(5.0)
+        s.connect(socket_path())
+        s.sendall(raw)
+        s.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = s.recv(65536)
+            if not chunk: break
+            chunks.append(chunk)
+        return b"".join(chunks) or None
+    except OSError as e:
+        logger.debug(f"Daemon unreachable: {e}")
+        return None
+    finally:
+        s.close()
+
+if __name__ == "__main__":
+    serve()
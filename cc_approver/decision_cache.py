@@ -0,0 +1,71 @@
+"""Persistent cross-process decision cache (SQLite, WAL).
+
+Exact repeats of (policy, tool, tool_input) skip the LLM entirely.
+Rows are keyed on a blake2b digest and carry the policy hash, so a
+policy edit invalidates old decisions without an explicit sweep.
+Opt-in via `"decisionCache": true` under dspyApprover settings.
+"""
+from __future__ import annotations
+import hashlib, json, logging, sqlite3, time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path.home() / ".cache" / "cc_approver" / "decisions.db"
+TTL_S = 7 * 24 * 3600
+
+_conn: Optional[sqlite3.Connection] = None
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(CACHE_PATH), timeout=1.0,
+                                check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            "key TEXT PRIMARY KEY, policy_hash TEXT NOT NULL, "
+            "decision TEXT NOT NULL, reason TEXT NOT NULL, ts REAL NOT NULL)")
+        _conn.commit()
+    return _conn
+
+def make_key(policy: str, tool: str,
+             tool_input: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (cache key, policy hash) for an exact tool-call repeat."""
+    policy_hash = hashlib.blake2b((policy or "").encode("utf-8"),
+                                  digest_size=8).hexdigest()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(policy_hash.encode("ascii"))
+    h.update((tool or "").encode("utf-8"))
+    h.update(json.dumps(tool_input or {}, sort_keys=True,
+                        ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest(), policy_hash
+
+def lookup(key: str, policy_hash: str,
+           ttl: float = TTL_S) -> Optional[Tuple[str, str]]:
+    try:
+        row = _connect().execute(
+            "SELECT decision, reason, policy_hash, ts FROM decisions WHERE key=?",
+            (key,)).fetchone()
+    except sqlite3.Error as e:
+        logger.debug(f"Decision cache lookup failed: {e}")
+        return None
+    if not row:
+        return None
+    decision, reason, stored_hash, ts = row
+    if stored_hash != policy_hash or time.time() - ts > ttl:
+        return None
+    return decision, reason
+
+def store(key: str, policy_hash: str, decision: str, reason: str) -> None:
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO decisions (key, policy_hash, decision, reason, ts) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, policy_hash, decision, reason, time.time()))
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.debug(f"Decision cache store failed: {e}")
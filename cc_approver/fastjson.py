@@ -0,0 +1,26 @@
+"""JSON shim: orjson when available, stdlib json otherwise."""
+from __future__ import annotations
+from typing import Any, Union
+
+try:
+    import orjson as _orjson
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return _orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return _orjson.dumps(obj).decode("utf-8")
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _orjson.dumps(obj)
+except ImportError:
+    import json as _json
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return _json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return _json.dumps(obj)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _json.dumps(obj).encode("utf-8")
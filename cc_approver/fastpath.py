@@ -0,0 +1,129 @@
+"""Pre-LLM fast path: rules mined from the user's labeled JSONL.
+
+The hook consults these rules before any LLM call; a match answers in
+sub-ms with no API spend. Rules are never hardcoded — they are learned
+from the same training data `optimize` uses (see `cc-approver learn-rules`)
+and stored next to the settings file, so the fast path only exists once
+the user has opted in by generating it.
+"""
+from __future__ import annotations
+import json, logging, os, re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .constants import VALID_DECISIONS
+from . import fastjson
+
+logger = logging.getLogger(__name__)
+
+RULES_FILENAME = "fastpath.json"
+DEFAULT_MIN_COUNT = 3
+
+# path -> ((st_mtime_ns, st_size), rules)
+_RULES_CACHE: Dict[str, tuple] = {}
+
+def rules_path(project_dir: Optional[str] = None) -> Path:
+    proj = project_dir or os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    return Path(proj) / ".claude" / RULES_FILENAME
+
+def load_rules(path: Path) -> List[dict]:
+    sp = str(path)
+    try:
+        st = os.stat(sp)
+    except OSError:
+        return []
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _RULES_CACHE.get(sp)
+    if cached and cached[0] == sig:
+        return cached[1]
+    try:
+        rules = fastjson.loads(path.read_bytes())
+    except (ValueError, IOError) as e:
+        logger.debug(f"Failed to read fast-path rules {path}: {e}")
+        return []
+    rules = [r for r in rules if isinstance(r, dict)
+             and r.get("decision") in VALID_DECISIONS] if isinstance(rules, list) else []
+    _RULES_CACHE[sp] = (sig, rules)
+    return rules
+
+def classify(tool: str, tool_input: Dict[str, Any],
+             rules: List[dict]) -> Optional[str]:
+    """Return a decision for a rule match, or None to fall through to the LLM."""
+    if not rules:
+        return None
+    text = None
+    for r in rules:
+        if r.get("tool") != tool:
+            continue
+        pattern = r.get("pattern")
+        if not pattern:
+            return r["decision"]
+        if text is None:
+            text = json.dumps(tool_input or {}, ensure_ascii=False)
+        try:
+            if re.search(pattern, text):
+                return r["decision"]
+        except re.error as e:
+            logger.debug(f"Bad fast-path pattern {pattern!r}: {e}")
+    return None
+
+def fast_decision(tool: str, tool_input: Dict[str, Any],
+                  project_dir: Optional[str] = None) -> Optional[str]:
+    return classify(tool, tool_input, load_rules(rules_path(project_dir)))
+
+def _first_token(command: str) -> Optional[str]:
+    tok = (command or "").strip().split(None, 1)
+    return tok[0] if tok else None
+
+def learn_rules(train_path: Path, min_count: int = DEFAULT_MIN_COUNT) -> List[dict]:
+    """Mine high-confidence rules from labeled JSONL.
+
+    A rule is emitted only when every example in a bucket agrees on the
+    label and the bucket has at least `min_count` examples: whole tools
+    first, then Bash commands grouped by their leading token.
+    """
+    by_tool: Dict[str, Dict[str, int]] = {}
+    by_bash_tok: Dict[str, Dict[str, int]] = {}
+    with Path(train_path).open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            tool = obj.get("tool_name") or obj.get("tool") or ""
+            label = (obj.get("label") or obj.get("decision") or "").strip().lower()
+            if not tool or label not in VALID_DECISIONS:
+                continue
+            by_tool.setdefault(tool, {}).setdefault(label, 0)
+            by_tool[tool][label] += 1
+            if tool == "Bash":
+                try:
+                    tinput = json.loads(obj.get("tool_input_json") or "{}")
+                except json.JSONDecodeError:
+                    tinput = {}
+                tok = _first_token((tinput or {}).get("command") or "")
+                if tok:
+                    by_bash_tok.setdefault(tok, {}).setdefault(label, 0)
+                    by_bash_tok[tok][label] += 1
+
+    rules: List[dict] = []
+    for tool, counts in sorted(by_tool.items()):
+        if len(counts) == 1 and sum(counts.values()) >= min_count:
+            rules.append({"tool": tool, "decision": next(iter(counts))})
+    covered = {r["tool"] for r in rules}
+    for tok, counts in sorted(by_bash_tok.items()):
+        if "Bash" in covered:
+            break
+        if len(counts) == 1 and sum(counts.values()) >= min_count:
+            rules.append({"tool": "Bash",
+                          "pattern": r'"command":\s*"' + re.escape(tok) + r'\b',
+                          "decision": next(iter(counts))})
+    return rules
+
+def write_rules(rules: List[dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(rules, f, indent=2, ensure_ascii=False)
+        f.write("\n")
@@ -1,34 +1,113 @@
 from __future__ import annotations
-import json, os, sys, logging
+import json, os, re, sys, logging
 from pathlib import Path
-from typing import Dict, Any
-from .approver import ApproverProgram, configure_lm, try_load_compiled, run_program
+from typing import Dict, Any, List, Optional
+from .approver import (
+    ApproverProgram, configure_lm, try_load_compiled, run_program,
+    run_program_batch, _default_program
+)
 from .settings import load_and_merge_settings, get_dspy_config, get_merged_policy
 from .constants import DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS, HOOK_EVENT_NAME
 from .validators import normalize_decision, truncate_reason
+from .paths import compiled_candidates, resolve_compiled_candidate
+from . import fastjson
 
 logger = logging.getLogger(__name__)
 
 def main() -> None:
-    verbose = os.environ.get("CC_APPROVER_VERBOSE", "").lower() == "true"
-    try: 
-        payload: Dict[str, Any] = json.load(sys.stdin)
-    except (json.JSONDecodeError, IOError) as e:
+    try:
+        raw = sys.stdin.read()
+    except (IOError, OSError) as e:
+        logger.debug(f"Failed to read stdin: {e}")
+        raw = ""
+
+    from .daemon import daemon_enabled
+    if daemon_enabled():
+        from .daemon import request, spawn
+        reply = request(raw.encode("utf-8"))
+        if reply is not None:
+            sys.stdout.write(reply.decode("utf-8"))
+            return
+        spawn()  # warm it up for the next call; answer this one in-process
+
+    try:
+        payload: Dict[str, Any] = fastjson.loads(raw) if raw.strip() else {}
+    except ValueError as e:
         logger.debug(f"Failed to parse JSON from stdin: {e}")
         payload = {}
+    print(fastjson.dumps(decide(payload)))
+
+
+def serve_lines() -> None:
+    """Serve newline-delimited JSON requests over stdio, one reply per line.
+
+    Keeps one warm process (imports, caches) across many decisions; used by
+    `cc-approver hook --serve` and the end-to-end test harness.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload: Dict[str, Any] = fastjson.loads(line)
+        except ValueError as e:
+            logger.debug(f"Failed to parse JSON line: {e}")
+            payload = {}
+        try:
+            reply = decide(payload)
+        except Exception as e:
+            logger.debug(f"Decision failed in serve mode: {e}")
+            reply = {"hookSpecificOutput":{
+                "hookEventName":HOOK_EVENT_NAME,
+                "permissionDecision":"ask",
+                "permissionDecisionReason":"error during decision"
+            }}
+        sys.stdout.write(fastjson.dumps(reply) + "\n")
+        sys.stdout.flush()
+
+
+def decide(payload: Dict[str, Any],
+           program: Optional[ApproverProgram] = None) -> Dict[str, Any]:
+    """Run one permission decision; pass a pre-loaded program to skip LM setup."""
+    verbose = os.environ.get("CC_APPROVER_VERBOSE", "").lower() == "true"
     tool: str = payload.get("tool_name","") or ""
     tinput: Dict[str, Any] = payload.get("tool_input",{}) or {}
     tpath: str = payload.get("transcript_path","") or ""
-    
+
     if verbose:
         print(f"VERBOSE: Tool={tool}", file=sys.stderr)
         print(f"VERBOSE: Input={json.dumps(tinput)[:500]}", file=sys.stderr)
         print(f"VERBOSE: Project={os.environ.get('CLAUDE_PROJECT_DIR', 'not set')}", file=sys.stderr)
 
     proj = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+
+    from .fastpath import fast_decision
+    fast = fast_decision(tool, tinput, proj)
+    if fast is not None:
+        if verbose:
+            print(f"VERBOSE: Fast-path rule matched: {fast}", file=sys.stderr)
+        return {"hookSpecificOutput":{
+            "hookEventName":HOOK_EVENT_NAME,
+            "permissionDecision":fast,
+            "permissionDecisionReason":"" if fast == "allow" else "matched learned fast-path rule"
+        }}
+
     settings, settings_path = load_and_merge_settings(proj)
     cfg = get_dspy_config(settings, proj)
-    
+
+    # Optional allowlist over tool names: calls outside it skip DSPy entirely
+    # (useful when the Claude Code matcher is broader than the policy's scope).
+    fast_matcher = settings.get("fastMatcher")
+    if fast_matcher and tool and not _matcher_hit(_compile_matcher(fast_matcher), tool):
+        skipped = normalize_decision(settings.get("fastMatcherDecision", "allow"))
+        if verbose:
+            print(f"VERBOSE: fastMatcher miss, returning {skipped}", file=sys.stderr)
+        return {"hookSpecificOutput":{
+            "hookEventName":HOOK_EVENT_NAME,
+            "permissionDecision":skipped,
+            "permissionDecisionReason":"" if skipped == "allow" else "tool outside fastMatcher"
+        }}
+
     if verbose:
         print(f"VERBOSE: Settings loaded from: {settings_path}", file=sys.stderr)
         print(f"VERBOSE: Policy: {get_merged_policy(settings)[:200]}...", file=sys.stderr)
@@ -38,15 +117,30 @@ def main() -> None:
     model = cfg.get("model")
     api_base = cfg.get("apiBase")
     api_key = cfg.get("apiKey")
-    configure_lm(model, extra_body=extra_body,
-                 api_base=api_base, api_key=api_key)
-    candidates = [cfg["compiledModelPath"],
-                  str(Path(proj)/".claude/models/approver.compiled.json"),
-                  str(Path.home()/".claude/models/approver.compiled.json")]
-    program = try_load_compiled(candidates) or ApproverProgram()
+    if program is None:
+        configure_lm(model, extra_body=extra_body,
+                     api_base=api_base, api_key=api_key)
+        resolved = resolve_compiled_candidate(proj, cfg)
+        program = (try_load_compiled([resolved]) if resolved else None) or _default_program()
 
     policy = get_merged_policy(settings)
     history = tail(tpath, cfg["historyBytes"])
+
+    # Exact-repeat cache (opt-in, skipped when history feeds the decision).
+    cache = key = policy_hash = None
+    if cfg.get("decisionCache") and not history:
+        from . import decision_cache as cache
+        key, policy_hash = cache.make_key(policy, tool, tinput)
+        hit = cache.lookup(key, policy_hash)
+        if hit is not None:
+            if verbose:
+                print("VERBOSE: Decision cache hit", file=sys.stderr)
+            return {"hookSpecificOutput":{
+                "hookEventName":HOOK_EVENT_NAME,
+                "permissionDecision":hit[0],
+                "permissionDecisionReason":hit[1]
+            }}
+
     try:
         res = run_program(program, policy, tool, tinput, history)
     except Exception as e:
@@ -62,21 +156,79 @@ def main() -> None:
     decision = normalize_decision(res.decision)
     reason = truncate_reason(getattr(res, "reason", ""))
 
-    print(json.dumps({"hookSpecificOutput":{
+    if cache is not None:
+        cache.store(key, policy_hash, decision, reason)
+
+    return {"hookSpecificOutput":{
         "hookEventName":HOOK_EVENT_NAME,
         "permissionDecision":decision,
         "permissionDecisionReason":reason
-    }}))
+    }}
+
+# pattern -> frozenset (trivial alternation like "Bash|Edit|Write") or
+# compiled regex; compiled once per pattern, not per approval.
+_MATCHER_CACHE: Dict[str, Any] = {}
+
+def _compile_matcher(pattern: str) -> Any:
+    m = _MATCHER_CACHE.get(pattern)
+    if m is None:
+        if re.fullmatch(r"[\w|]+", pattern):
+            m = frozenset(pattern.split("|"))
+        else:
+            try:
+                m = re.compile(pattern)
+            except re.error as e:
+                logger.debug(f"Bad fastMatcher pattern {pattern!r}: {e}")
+                m = re.compile(r".*")  # never short-circuit on a bad pattern
+        _MATCHER_CACHE[pattern] = m
+    return m
+
+def _matcher_hit(matcher: Any, tool: str) -> bool:
+    if isinstance(matcher, frozenset):
+        return tool in matcher
+    return matcher.fullmatch(tool) is not None
+
+def decide_batch(payloads: List[Dict[str, Any]],
+                 program: ApproverProgram) -> List[Dict[str, Any]]:
+    """Decide several coalesced payloads with one batched program call."""
+    proj = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    settings, _ = load_and_merge_settings(proj)
+    cfg = get_dspy_config(settings, proj)
+    policy = get_merged_policy(settings)
+    items = [{"tool": p.get("tool_name","") or "",
+              "tool_input": p.get("tool_input",{}) or {},
+              "history_tail": tail(p.get("transcript_path","") or "", cfg["historyBytes"])}
+             for p in payloads]
+    preds = run_program_batch(program, policy, items)
+    return [{"hookSpecificOutput":{
+        "hookEventName":HOOK_EVENT_NAME,
+        "permissionDecision":normalize_decision(pred.decision),
+        "permissionDecisionReason":truncate_reason(getattr(pred, "reason", ""))
+    }} for pred in preds]
+
+# path -> ((st_mtime_ns, st_size, n), text); repeated approvals against an
+# unchanged transcript (daemon / long sessions) skip the read entirely.
+_TAIL_CACHE: Dict[str, tuple] = {}
 
 def tail(path: str, n: int) -> str:
     if not path or n <= 0: return ""
     try:
-        with open(path, "rb") as f:
-            f.seek(0,2); sz=f.tell(); f.seek(max(0, sz-n))
-            return f.read().decode("utf-8","ignore")[-n:]
-    except (FileNotFoundError, IOError) as e:
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size, n)
+        cached = _TAIL_CACHE.get(path)
+        if cached and cached[0] == sig:
+            return cached[1]
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        try:
+            buf = os.pread(fd, n, max(0, st.st_size - n))
+        finally:
+            os.close(fd)
+        text = buf.decode("utf-8","ignore")[-n:]
+        _TAIL_CACHE[path] = (sig, text)
+        return text
+    except OSError as e:
         logger.debug(f"Failed to read file tail: {e}")
         return ""
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,14 +1,19 @@
 """Data models for cc_approver package."""
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from .constants import (
     DEFAULT_MODEL, DEFAULT_HISTORY_BYTES, DEFAULT_COMPILED_PATH,
     DEFAULT_MATCHER, DEFAULT_TIMEOUT, VALID_DECISIONS
 )
 from .validators import normalize_decision, normalize_label
 
+# Frozen models skip assignment validation and share a compiled schema;
+# extra='ignore' keeps unknown settings keys from failing validation.
+_MODEL_CONFIG = ConfigDict(frozen=True, validate_assignment=False, extra='ignore')
+
 class DspyConfig(BaseModel):
     """Configuration for DSPy approver."""
+    model_config = _MODEL_CONFIG
     model: str = Field(default=DEFAULT_MODEL, description="Model name")
     historyBytes: int = Field(default=DEFAULT_HISTORY_BYTES, ge=0)
     compiledModelPath: str = Field(default=DEFAULT_COMPILED_PATH)
@@ -18,10 +23,12 @@ class DspyConfig(BaseModel):
 
 class PolicyConfig(BaseModel):
     """Policy configuration."""
+    model_config = _MODEL_CONFIG
     approverInstructions: str = Field(default="", description="Policy text")
 
 class HookConfig(BaseModel):
     """Hook configuration."""
+    model_config = _MODEL_CONFIG
     name: str = "cc-approver"
     command: str
     matcher: str = Field(default=DEFAULT_MATCHER)
@@ -29,22 +36,33 @@ class HookConfig(BaseModel):
 
 class TrainingExample(BaseModel):
     """Training example for optimizer."""
+    model_config = ConfigDict(frozen=True, validate_assignment=False,
+                              extra='ignore', populate_by_name=True)
     tool_name: Optional[str] = Field(None, alias="tool")
     tool_input_json: Optional[str] = None
     tool_input: Optional[Dict[str, Any]] = None
     label: str
     transcript_path: Optional[str] = None
     history_tail: Optional[str] = None
-    
-    @validator('label')
+
+    @field_validator('label', mode='before')
+    @classmethod
     def normalize_label_field(cls, v: str) -> str:
         return normalize_label(v)
 
 class DecisionResult(BaseModel):
     """Decision result from approver."""
+    model_config = _MODEL_CONFIG
     decision: str
     reason: str
-    
-    @validator('decision')
+
+    @field_validator('decision', mode='before')
+    @classmethod
     def normalize_decision_field(cls, v: str) -> str:
-        return normalize_decision(v)
\ No newline at end of file
+        return normalize_decision(v)
+
+    @classmethod
+    def from_raw(cls, decision: str, reason: str) -> "DecisionResult":
+        """Fast path for already-trusted values: skips schema validation."""
+        return cls.model_construct(decision=normalize_decision(decision),
+                                   reason=reason or "")
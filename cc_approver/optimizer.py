@@ -1,14 +1,15 @@
 from __future__ import annotations
-import json, random, sys, logging
+import functools, gzip, json, os, random, sys, logging
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 import dspy
 from .approver import ApproverProgram
 from .settings import get_policy_text
+from . import fastjson
 from .constants import (
     VALID_DECISIONS, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS,
     REFLECTION_TEMPERATURE, REFLECTION_MAX_TOKENS,
-    VALIDATION_SPLIT_RATIO, RANDOM_SEED
+    VALIDATION_SPLIT_RATIO, RANDOM_SEED, EVAL_NUM_THREADS
 )
 
 logger = logging.getLogger(__name__)
@@ -17,29 +18,43 @@ logger = logging.getLogger(__name__)
 
 def _normalize_tool_input(obj: dict) -> str:
     """Extract tool input from various formats."""
-    if isinstance(obj.get("tool_input_json"), str):
-        return obj["tool_input_json"]
-    elif isinstance(obj.get("tool_input"), (dict, list)):
-        return json.dumps(obj["tool_input"], ensure_ascii=False)
-    elif isinstance(obj.get("tool_input_preview"), str):
-        return obj["tool_input_preview"]
+    ti = obj.get("tool_input_json")
+    if isinstance(ti, str):
+        return ti
+    ti = obj.get("tool_input")
+    if isinstance(ti, (dict, list)):
+        return fastjson.dumps(ti)
+    ti = obj.get("tool_input_preview")
+    if isinstance(ti, str):
+        return ti
     return "{}"
 
+@functools.lru_cache(maxsize=1024)
+def _tail_text(path: str, history_bytes: int, mtime_ns: int) -> str:
+    """Last `history_bytes` of a file; mtime_ns keys the cache, one pread per miss."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        sz = os.fstat(fd).st_size
+        buf = os.pread(fd, history_bytes, max(0, sz - history_bytes))
+    finally:
+        os.close(fd)
+    return buf.decode("utf-8", "ignore")[-history_bytes:]
+
 def _read_history(obj: dict, history_bytes: int) -> str:
     """Read history from transcript or return existing."""
-    hist = obj.get("history_tail") or ""
-    if hist or history_bytes <= 0:
+    if history_bytes <= 0:
+        # Common CLI default: no history capture, one dict probe and out.
+        return obj.get("history_tail") or ""
+    hist = obj.get("history_tail")
+    if hist:
         return hist
     path = obj.get("transcript_path")
     if not isinstance(path, str):
         return ""
     try:
-        with open(path, "rb") as f:
-            f.seek(0, 2)
-            sz = f.tell()
-            f.seek(max(0, sz - history_bytes))
-            return f.read().decode("utf-8", "ignore")[-history_bytes:]
-    except (FileNotFoundError, IOError):
+        # Rows sharing a transcript (common in bootstrapped sets) read it once.
+        return _tail_text(path, history_bytes, os.stat(path).st_mtime_ns)
+    except OSError:
         return ""
 
 def _normalize(obj: dict, policy: str, history_bytes: int) -> dict:
@@ -49,40 +64,228 @@ def _normalize(obj: dict, policy: str, history_bytes: int) -> dict:
     label = (obj.get("label") or obj.get("decision") or "").strip().lower()
     return {"tool": tool, "tool_input_json": ti, "history_tail": hist, "label": label, "policy": policy}
 
+# Files below this size parse fast enough that a sidecar cache is pure overhead.
+_CACHE_MIN_BYTES = 64 * 1024
+# Below this, importing pandas costs more than the row loop it replaces.
+_VECTORIZE_MIN_BYTES = 1 << 20
+
+def _read_jsonl_vectorized(path: Path, policy: str, history_bytes: int) -> List[dspy.Example]:
+    """Bulk ingestion for large files: pandas parses the JSONL and filters
+    labels as vectorized column ops; callers fall back to the row loop when
+    pandas is missing or the frame looks unexpected."""
+    import pandas as pd
+    df = pd.read_json(path, lines=True)
+    cols = df.columns
+    label = df["label"] if "label" in cols else pd.Series("", index=df.index)
+    if "decision" in cols:
+        label = label.where(label.notna() & (label != ""), df["decision"])
+    label = label.fillna("").astype(str).str.strip().str.lower()
+    keep = label.isin(VALID_DECISIONS)
+    out: List[dspy.Example] = []
+    for obj, lab in zip(df[keep].to_dict("records"), label[keep].tolist()):
+        # pandas fills missing cells with NaN; drop them so the per-row
+        # helpers see the same shapes as plain json.loads rows.
+        clean = {k: v for k, v in obj.items()
+                 if not (isinstance(v, float) and v != v)}
+        tool = clean.get("tool_name") or clean.get("tool") or ""
+        out.append(dspy.Example(
+            policy=policy, tool=tool,
+            tool_input_json=_normalize_tool_input(clean),
+            history_tail=_read_history(clean, history_bytes), decision=lab
+        ).with_inputs("policy","tool","tool_input_json","history_tail"))
+    return out
+
+def _dataset_cache_key(st: os.stat_result, policy: str,
+                       history_bytes: int) -> str:
+    import hashlib
+    ph = hashlib.blake2b(policy.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{st.st_mtime_ns}:{st.st_size}:{history_bytes}:{ph}"
+
 def read_jsonl(path: Path, policy: str, history_bytes: int) -> List[dspy.Example]:
+    # Large training files keep a pickled sidecar of the built examples
+    # at a fixed name (train.jsonl -> train.cache.pkl), so repeat CLI
+    # runs load in one pickle.load instead of re-parsing. The freshness
+    # key (mtime, size, history budget, policy) lives inside the pickle,
+    # so edits overwrite one sidecar instead of littering new files.
+    import pickle
+    cache = None
+    cache_key = ""
+    size = 0
+    try:
+        st = os.stat(path)
+        size = st.st_size
+        if size >= _CACHE_MIN_BYTES:
+            cache = path.with_suffix(".cache.pkl")
+            cache_key = _dataset_cache_key(st, policy, history_bytes)
+            with cache.open("rb") as f:
+                stored_key, examples = pickle.load(f)
+            if stored_key == cache_key:
+                return examples
+    except OSError:
+        pass
+    except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as e:
+        logger.debug(f"Ignoring corrupt dataset cache {cache}: {e}")
+    out = None
+    if size >= _VECTORIZE_MIN_BYTES:
+        try:
+            out = _read_jsonl_vectorized(path, policy, history_bytes)
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.debug(f"Vectorized JSONL parse failed, using row loop: {e}")
+    if out is None:
+        out = _read_jsonl_uncached(path, policy, history_bytes)
+    if cache is not None:
+        try:
+            with cache.open("wb") as f:
+                pickle.dump((cache_key, out), f, protocol=5)
+        except OSError as e:
+            logger.debug(f"Failed to write dataset cache {cache}: {e}")
+    return out
+
+def _read_jsonl_uncached(path: Path, policy: str, history_bytes: int) -> List[dspy.Example]:
     out: List[dspy.Example] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            try: 
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                logger.debug(f"Skipping invalid JSON line: {line[:50]}...")
-                continue
-            ex = _normalize(obj, policy, history_bytes)
-            if ex["label"] not in VALID_DECISIONS: continue
-            out.append(dspy.Example(
-                policy=ex["policy"], tool=ex["tool"],
-                tool_input_json=ex["tool_input_json"], history_tail=ex["history_tail"],
-                decision=ex["label"]
-            ).with_inputs("policy","tool","tool_input_json","history_tail"))
+    # Bootstrapped sets repeat rows verbatim; keying on the raw line means each
+    # unique row is parsed, re-serialized and history-read exactly once.
+    seen: Dict[bytes, Optional[tuple]] = {}
+    # Binary mode: orjson parses bytes directly, skipping a per-line decode.
+    # One bulk read + split beats the line iterator's many small reads.
+    with path.open("rb", buffering=1 << 16) as f:
+        data = f.read()
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if not line: continue
+        if line in seen:
+            fields = seen[line]
+            if fields is not None:
+                out.append(dspy.Example(
+                    policy=policy, tool=fields[0], tool_input_json=fields[1],
+                    history_tail=fields[2], decision=fields[3]
+                ).with_inputs("policy","tool","tool_input_json","history_tail"))
+            continue
+        try:
+            obj = fastjson.loads(line)
+        except ValueError:
+            logger.debug(f"Skipping invalid JSON line: {line[:50]}...")
+            seen[line] = None
+            continue
+        # Inlined _normalize: label first so rejected rows skip the
+        # tool-input serialization and history read entirely.
+        _get = obj.get
+        label = (_get("label") or _get("decision") or "").strip().lower()
+        if label not in VALID_DECISIONS:
+            seen[line] = None
+            continue
+        tool = _get("tool_name") or _get("tool") or ""
+        ti = _normalize_tool_input(obj)
+        hist = _read_history(obj, history_bytes)
+        seen[line] = (tool, ti, hist, label)
+        out.append(dspy.Example(
+            policy=policy, tool=tool, tool_input_json=ti,
+            history_tail=hist, decision=label
+        ).with_inputs("policy","tool","tool_input_json","history_tail"))
     return out
 
+def compress_compiled(path: Path, history_bytes: int) -> Path:
+    """Prune and gzip a saved compiled artifact for faster cold loads.
+
+    Drops embedded "lm" provider state and truncates demo history_tail
+    fields to the configured history budget, then writes `<path>.gz`.
+    try_load_compiled prefers the .gz when present.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+
+    def _scrub(node):
+        if isinstance(node, dict):
+            node.pop("lm", None)
+            ht = node.get("history_tail")
+            if isinstance(ht, str) and len(ht) > history_bytes:
+                node["history_tail"] = ht[-history_bytes:] if history_bytes > 0 else ""
+            for v in node.values():
+                _scrub(v)
+        elif isinstance(node, list):
+            for v in node:
+                _scrub(v)
+
+    _scrub(data)
+    gz = Path(str(path) + ".gz")
+    with gzip.open(gz, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(data, f, ensure_ascii=False)
+    return gz
+
+def _split_train_dev(train: List[dspy.Example]) -> Tuple[List[dspy.Example], List[dspy.Example]]:
+    """Seeded dev split; permutation runs in C via numpy when available."""
+    k = max(1, int(VALIDATION_SPLIT_RATIO * len(train)))
+    try:
+        import numpy as np
+        idx = np.random.default_rng(RANDOM_SEED).permutation(len(train)).tolist()
+        return [train[i] for i in idx[k:]], [train[i] for i in idx[:k]]
+    except ImportError:
+        random.Random(RANDOM_SEED).shuffle(train)
+        return train[k:], train[:k]
+
 # ---------- Metrics ----------
 
+# Canonical decision strings; metrics compare by identity after this map.
+_CANON = {"allow": "allow", "deny": "deny", "ask": "ask"}
+
+def _norm(s: Optional[str]) -> str:
+    # read_jsonl already lower-cases gold labels, so the direct probe hits on
+    # the hot path; anything else pays one strip/lower. Invalid maps to "".
+    c = _CANON.get(s or "")
+    if c is not None:
+        return c
+    return _CANON.get((s or "").strip().lower(), "")
+
 def acc_metric(ex: dspy.Example, pred: dspy.Prediction, **kwargs) -> float:
-    y, yhat = (ex.decision or "").strip().lower(), (pred.decision or "").strip().lower()
-    return 1.0 if y == yhat and yhat in VALID_DECISIONS else 0.0
+    y, yhat = _norm(ex.decision), _norm(pred.decision)
+    return 1.0 if y is yhat and y else 0.0
 
 def gepa_metric(gold: dspy.Example, pred: dspy.Prediction, **_):
-    y, yhat = (gold.decision or "").strip().lower(), (pred.decision or "").strip().lower()
-    if y == yhat and yhat in VALID_DECISIONS:
+    y, yhat = _norm(gold.decision), _norm(pred.decision)
+    if y is yhat and y:
         return {"score": 1.0, "feedback": "Correct. Keep responses concise."}
     return {"score": 0.0, "feedback": f"Expected {y}, got {yhat}. Emphasize policy and safety."}
 
+@functools.lru_cache(maxsize=8)
+def _lm(model: str, temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None) -> dspy.LM:
+    """One dspy.LM per configuration; repeated roles share the client."""
+    kwargs = {}
+    if temperature is not None: kwargs["temperature"] = temperature
+    if max_tokens is not None: kwargs["max_tokens"] = max_tokens
+    return dspy.LM(model, **kwargs)
+
+def _load_warm_start(prog: ApproverProgram, path: Path) -> None:
+    """Load compiled warm-start state, mmap-ing the file so the page cache
+    feeds the parser directly; falls back to dspy's own loader."""
+    try:
+        import mmap
+        fd = os.open(str(path), os.O_RDONLY)
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                state = fastjson.loads(mm[:])
+        finally:
+            os.close(fd)
+        prog.load_state(state)
+        return
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.debug(f"mmap warm-start load failed, using prog.load: {e}")
+    try:
+        prog.load(str(path))
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.debug(f"Failed to load warm start model: {e}")
+
 # ---------- Optimize ----------
 
+def _make_teleprompter(cls, kwargs: Dict[str, Any], num_threads: int):
+    """Construct an optimizer with num_threads, dropping it on older APIs."""
+    try:
+        return cls(**kwargs, num_threads=num_threads)
+    except TypeError:
+        logger.debug(f"{cls.__name__} doesn't support num_threads parameter")
+        return cls(**kwargs)
+
 def _prepare_datasets(train_path: Path, val_path: Optional[Path], 
                       policy: str, history_bytes: int) -> Tuple[List[dspy.Example], List[dspy.Example]]:
     """Load and prepare training and validation datasets."""
@@ -93,61 +296,64 @@ def _prepare_datasets(train_path: Path, val_path: Optional[Path],
     if val_path:
         dev = read_jsonl(val_path, policy, history_bytes)
     else:
-        random.Random(RANDOM_SEED).shuffle(train)
-        k = max(1, int(VALIDATION_SPLIT_RATIO * len(train)))
-        dev, train = train[:k], train[k:]
-    
+        train, dev = _split_train_dev(train)
+
     return train, dev
 
 def optimize_from_files(*, task_model: str, train_path: Path, val_path: Optional[Path],
                         optimizer: str, auto: str, settings: dict,
                         prompt_model: Optional[str], reflection_model: Optional[str],
                         eval_model: Optional[str], history_bytes: int,
-                        warm_start: Optional[Path]) -> tuple[ApproverProgram, float]:
-    dspy.configure(lm=dspy.LM(task_model, temperature=DEFAULT_TEMPERATURE, max_tokens=DEFAULT_MAX_TOKENS))
+                        warm_start: Optional[Path],
+                        num_threads: int = EVAL_NUM_THREADS) -> tuple[ApproverProgram, float]:
+    dspy.configure(lm=_lm(task_model, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS))
     policy = get_policy_text(settings)
-    train = read_jsonl(train_path, policy, history_bytes)
-    if not train:
+    try:
+        train, dev = _prepare_datasets(train_path, val_path, policy, history_bytes)
+    except ValueError:
         print("No training examples.", file=sys.stderr); sys.exit(1)
-    if val_path: dev = read_jsonl(val_path, policy, history_bytes)
-    else:
-        random.Random(RANDOM_SEED).shuffle(train); k = max(1, int(VALIDATION_SPLIT_RATIO*len(train))); dev, train = train[:k], train[k:]
 
     prog = ApproverProgram()
     if warm_start and Path(warm_start).exists():
-        try:
-            prog.load(str(warm_start))
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.debug(f"Failed to load warm start model: {e}")
+        _load_warm_start(prog, Path(warm_start))
 
     if optimizer == "mipro":
         try:
             from dspy.teleprompt import MIPROv2
-            tp = MIPROv2(metric=acc_metric, auto=auto)
+            tp = _make_teleprompter(MIPROv2, dict(metric=acc_metric, auto=auto),
+                                    num_threads)
             if prompt_model:
-                try: 
-                    tp = MIPROv2(metric=acc_metric, auto=auto, prompt_model=dspy.LM(prompt_model))
+                try:
+                    tp = _make_teleprompter(
+                        MIPROv2,
+                        dict(metric=acc_metric, auto=auto, prompt_model=_lm(prompt_model)),
+                        num_threads)
                 except TypeError:
                     logger.debug("MIPROv2 doesn't support prompt_model parameter")
         except ImportError:
             from dspy.optimizers import MIPROv2
-            tp = MIPROv2(metric=acc_metric, auto=auto)
+            tp = _make_teleprompter(MIPROv2, dict(metric=acc_metric, auto=auto),
+                                    num_threads)
         compiled = tp.compile(prog, trainset=train, valset=dev)
     else:
         try:
             from dspy.teleprompt import GEPA
         except ImportError:
             from dspy.optimizers import GEPA
-        refl = dspy.LM(reflection_model or task_model, temperature=REFLECTION_TEMPERATURE, max_tokens=REFLECTION_MAX_TOKENS)
-        tp = GEPA(metric=gepa_metric, auto=auto, reflection_lm=refl, track_stats=False)
+        refl = _lm(reflection_model or task_model, REFLECTION_TEMPERATURE, REFLECTION_MAX_TOKENS)
+        tp = _make_teleprompter(
+            GEPA, dict(metric=gepa_metric, auto=auto, reflection_lm=refl, track_stats=False),
+            num_threads)
         compiled = tp.compile(prog, trainset=train, valset=dev)
 
+    # Evaluate aggregates metric scores internally; there is no Python-level
+    # per-example accumulation left to vectorize on this path.
+    from dspy.evaluate import Evaluate
+    evaluator = Evaluate(devset=dev, metric=acc_metric,
+                         num_threads=num_threads, display_progress=False)
     if eval_model:
-        with dspy.context(lm=dspy.LM(eval_model, temperature=DEFAULT_TEMPERATURE, max_tokens=DEFAULT_MAX_TOKENS)):
-            correct = sum(1 for ex in dev if (ex.decision.strip().lower() ==
-                      (compiled(policy=ex.policy, tool=ex.tool, tool_input_json=ex.tool_input_json, history_tail=ex.history_tail).decision or "").strip().lower()))
+        with dspy.context(lm=_lm(eval_model, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS)):
+            acc = evaluator(compiled).score / 100.0
     else:
-        correct = sum(1 for ex in dev if (ex.decision.strip().lower() ==
-                  (compiled(policy=ex.policy, tool=ex.tool, tool_input_json=ex.tool_input_json, history_tail=ex.history_tail).decision or "").strip().lower()))
-    acc = correct / max(1, len(dev))
+        acc = evaluator(compiled).score / 100.0
     return compiled, acc
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Compiled-model path resolution shared by the hook, daemon, and optimizer."""
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+def compiled_candidates(cfg: dict, proj: str) -> List[str]:
+    return [cfg["compiledModelPath"],
+            str(Path(proj)/".claude/models/approver.compiled.json"),
+            str(Path.home()/".claude/models/approver.compiled.json")]
+
+def first_existing(paths: Iterable[Union[str, Path]]) -> Optional[Path]:
+    """First path that stats successfully, expanded; None if nothing exists."""
+    for p in paths:
+        sp = os.path.expanduser(os.fspath(p))
+        try:
+            os.stat(sp)
+        except OSError:
+            continue
+        return Path(sp)
+    return None
+
+# (proj, configured compiled path) -> resolved path, kept while it still exists
+_RESOLVE_CACHE: Dict[tuple, str] = {}
+
+def resolve_compiled_candidate(proj: str, cfg: dict) -> Optional[str]:
+    """First existing compiled-model path for this project, cached.
+
+    Mirrors try_load_compiled's probe order: a pruned `<path>.gz`
+    sibling counts as (and wins over) its raw artifact, so gz-only
+    models stay visible to the hook.
+    """
+    key = (proj, cfg.get("compiledModelPath"))
+    hit = _RESOLVE_CACHE.get(key)
+    if hit is not None:
+        try:
+            os.stat(hit)
+            return hit
+        except OSError:
+            _RESOLVE_CACHE.pop(key, None)
+    p = first_existing(x for c in compiled_candidates(cfg, proj)
+                       for x in (os.fspath(c) + ".gz", c))
+    if p is None:
+        return None
+    _RESOLVE_CACHE[key] = str(p)
+    return str(p)
@@ -1,33 +1,55 @@
 from __future__ import annotations
-import os, json, logging
+import copy, functools, os, json, logging
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 from .constants import (
     DEFAULT_MATCHER, DEFAULT_TIMEOUT, DEFAULT_MODEL,
     DEFAULT_HISTORY_BYTES, DEFAULT_COMPILED_PATH
 )
+from . import fastjson
 
 logger = logging.getLogger(__name__)
 
+# path -> ((st_mtime_ns, st_size), parsed dict); settings files change rarely,
+# so repeated hook calls in one process skip parsing entirely.
+_JSON_CACHE: Dict[str, tuple] = {}
+
 def _read_json(p: Path) -> Optional[dict]:
+    sp = str(p)
+    try:
+        st = os.stat(sp)
+    except OSError as e:
+        logger.debug(f"Failed to stat JSON file {p}: {e}")
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _JSON_CACHE.get(sp)
+    if cached and cached[0] == sig:
+        return copy.deepcopy(cached[1])
     try:
-        with p.open("r", encoding="utf-8") as f: 
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, IOError) as e:
+        data = fastjson.loads(p.read_bytes())
+    except (FileNotFoundError, ValueError, IOError) as e:
         logger.debug(f"Failed to read JSON file {p}: {e}")
         return None
+    _JSON_CACHE[sp] = (sig, copy.deepcopy(data))
+    return data
 
 def _write_json(p: Path, data: dict) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False); f.write("\n")
 
-def settings_paths(project_dir: Optional[str] = None) -> Tuple[Path, Path, Path]:
-    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+@functools.lru_cache(maxsize=32)
+def _settings_paths_cached(project_dir: str, home: str) -> Tuple[Path, Path, Path]:
     proj = Path(project_dir)
     return (proj/".claude"/"settings.local.json",
             proj/".claude"/"settings.json",
-            Path.home()/".claude"/"settings.json")
+            Path(home)/".claude"/"settings.json")
+
+def settings_paths(project_dir: Optional[str] = None) -> Tuple[Path, Path, Path]:
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    # Deterministic in (project, home): memoized so repeat chain walks skip
+    # rebuilding three Path objects.
+    return _settings_paths_cached(project_dir, str(Path.home()))
 
 def load_settings_chain(project_dir: Optional[str] = None) -> Tuple[Dict[str, Any], Path]:
     """Legacy function - loads first found settings file (no merging)."""
@@ -37,10 +59,36 @@ def load_settings_chain(project_dir: Optional[str] = None) -> Tuple[Dict[str, An
     _, project_path, _ = settings_paths(project_dir)
     return {}, project_path
 
+# (resolved project dir, per-file mtime signatures) -> (merged settings, path);
+# validated with three cheap stats so unchanged chains skip parse + merge.
+_CHAIN_CACHE: Dict[str, tuple] = {}
+
+def _chain_sig(paths: Tuple[Path, ...]) -> tuple:
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
 def load_and_merge_settings(project_dir: Optional[str] = None) -> Tuple[Dict[str, Any], Path]:
     """Load and merge settings from global → project → local."""
     local_path, project_path, global_path = settings_paths(project_dir)
-    
+
+    key = str(project_path.parent.parent)
+    sig = _chain_sig((local_path, project_path, global_path))
+    cached = _CHAIN_CACHE.get(key)
+    if cached and cached[0] == sig:
+        return copy.deepcopy(cached[1]), cached[2]
+    merged, path = _load_and_merge_uncached(local_path, project_path, global_path)
+    _CHAIN_CACHE[key] = (sig, copy.deepcopy(merged), path)
+    return merged, path
+
+def _load_and_merge_uncached(local_path: Path, project_path: Path,
+                             global_path: Path) -> Tuple[Dict[str, Any], Path]:
+
     # Load all settings files
     global_settings = _read_json(global_path) or {}
     project_settings = _read_json(project_path) or {}
@@ -101,16 +149,15 @@ def ensure_dspy_config(settings: dict, *,
                        prompt_model: str | None = None,
                        eval_model: str | None = None,
                        reflection_model: str | None = None):
-    cfg = settings.setdefault("dspyApprover", {})
-    # Only write fields that were explicitly provided
-    if model is not None: cfg["model"] = model
-    if history_bytes is not None: cfg["historyBytes"] = history_bytes
-    if compiled_path is not None: cfg["compiledModelPath"] = compiled_path
-    if optimizer is not None: cfg["optimizer"] = optimizer
-    if auto is not None: cfg["auto"] = auto
-    if prompt_model is not None: cfg["promptModel"] = prompt_model
-    if eval_model is not None: cfg["evalModel"] = eval_model
-    if reflection_model is not None: cfg["reflectionModel"] = reflection_model
+    # Only write fields that were explicitly provided; one update call
+    # instead of eight conditional hash-probe assignments.
+    updates = {k: v for k, v in (
+        ("model", model), ("historyBytes", history_bytes),
+        ("compiledModelPath", compiled_path), ("optimizer", optimizer),
+        ("auto", auto), ("promptModel", prompt_model),
+        ("evalModel", eval_model), ("reflectionModel", reflection_model),
+    ) if v is not None}
+    settings.setdefault("dspyApprover", {}).update(updates)
     return settings
 
 def merge_pretooluse_hook(settings: dict, *, command: str,
@@ -189,6 +236,7 @@ def get_dspy_config(settings: dict, project_dir: Optional[str] = None) -> dict:
         "extraBody": cfg.get("extraBody"),
         "apiBase": cfg.get("apiBase"),
         "apiKey": cfg.get("apiKey"),
+        "decisionCache": bool(cfg.get("decisionCache", False)),
     }
 
 def write_settings(settings: dict, path: Path) -> None:
@@ -1,7 +1,24 @@
 from __future__ import annotations
+import functools
 import os
-from pathlib import Path
-import questionary as q
+
+class _LazyQuestionary:
+    """Import-on-first-use proxy for the questionary module.
+
+    questionary drags in prompt_toolkit; defer that until a menu
+    actually prompts so scope-only callers stay import-light. Defined
+    as a module global (not PEP 562 __getattr__) so the bare `q` name
+    the menu functions use resolves too; forwarded attributes are
+    cached on the instance, and the proxy stays in place so patches of
+    `tui.q`/`q.select` keep working.
+    """
+    def __getattr__(self, name):
+        import questionary
+        attr = getattr(questionary, name)
+        setattr(self, name, attr)
+        return attr
+
+q = _LazyQuestionary()
 
 GEMINI_CHOICES = [
     "openrouter/google/gemini-2.5-flash-lite",
@@ -9,17 +26,50 @@ GEMINI_CHOICES = [
     "openrouter/google/gemini-2.5-pro",
 ]
 
+# Choice lists are static; build them once at import instead of per prompt.
+_MAIN_MENU_CHOICES = ["Init", "Optimize", "Exit"]
+_SCOPE_CHOICES = ["project", "global"]
+_OPTIMIZER_CHOICES = ["mipro", "gepa"]
+_AUTO_CHOICES = ["light", "medium", "heavy"]
+_TASK_MODEL_CHOICES = ["(use global)"] + GEMINI_CHOICES
+_SAME_AS_TASK_CHOICES = ["(same as task)"] + GEMINI_CHOICES
+
+@functools.lru_cache(maxsize=8)
+def _detect_scope(cwd: str, project_dir: str) -> str:
+    """Resolve the scope for one (cwd, CLAUDE_PROJECT_DIR) pair.
+
+    Memoized so menu re-entries skip the stat; one os.stat instead of
+    Path.exists() keeps it to a single syscall per cache miss.
+    """
+    here = project_dir or cwd
+    try:
+        os.stat(os.path.join(here, ".claude"))
+        return "project"
+    except OSError:
+        return "global"
+
 def detect_scope_default() -> str:
-    here = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
-    return "project" if (Path(here)/".claude").exists() else "global"
+    # When the env var decides, skip the getcwd syscall and keep the
+    # cache key canonical by passing an empty cwd.
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
+    return _detect_scope("" if project_dir else os.getcwd(), project_dir)
+
+def _to_int(raw, default: int) -> int:
+    """Parse a numeric prompt answer, falling back on blank or invalid input."""
+    try:
+        return int(raw or default)
+    except ValueError:
+        return default
 
 def main_menu():
-    return q.select("What do you want to do?", choices=["Init", "Optimize", "Exit"]).ask()
+    try:
+        return q.select("What do you want to do?", choices=_MAIN_MENU_CHOICES).ask()
+    except KeyboardInterrupt:
+        return "Exit"
 
 def init_menu():
-    scope = q.select("Scope?", choices=["project","global"], default=detect_scope_default()).ask()
-    model_choices = ["(use global)"] + GEMINI_CHOICES
-    model_raw = q.select("Task model?", choices=model_choices, default="(use global)").ask()
+    scope = q.select("Scope?", choices=_SCOPE_CHOICES, default=detect_scope_default()).ask()
+    model_raw = q.select("Task model?", choices=_TASK_MODEL_CHOICES, default="(use global)").ask()
     model = None if model_raw == "(use global)" else model_raw
     history = q.text("History bytes (0 = disabled):", default="0").ask()
     matcher = q.text("Matcher (regex of tools):", default="Bash|Edit|Write").ask()
@@ -29,26 +79,27 @@ def init_menu():
     return {
         "scope": scope,
         "model": model,
-        "history_bytes": int(history or "0"),
+        "history_bytes": _to_int(history, 0),
         "matcher": matcher or "Bash|Edit|Write",
-        "timeout": int(timeout or "10"),
+        "timeout": _to_int(timeout, 10),
         "policy_text": policy or "",
     }
 
 def optimize_menu():
-    scope = q.select("Scope?", choices=["project","global"], default=detect_scope_default()).ask()
-    optimizer = q.select("Optimizer?", choices=["mipro","gepa"], default="mipro").ask()
-    auto = q.select("Auto budget?", choices=["light","medium","heavy"], default="light").ask()
+    scope = q.select("Scope?", choices=_SCOPE_CHOICES, default=detect_scope_default()).ask()
+    optimizer = q.select("Optimizer?", choices=_OPTIMIZER_CHOICES, default="mipro").ask()
+    auto = q.select("Auto budget?", choices=_AUTO_CHOICES, default="light").ask()
     task_model = q.select("Task model?", choices=GEMINI_CHOICES, default=GEMINI_CHOICES[0]).ask()
-    prompt_model = q.select("Prompt/teacher model (MIPROv2)?", choices=["(same as task)"] + GEMINI_CHOICES,
+    prompt_model = q.select("Prompt/teacher model (MIPROv2)?", choices=_SAME_AS_TASK_CHOICES,
                             default="(same as task)").ask()
-    reflection_model = q.select("Reflection model (GEPA)?", choices=["(same as task)"] + GEMINI_CHOICES,
+    reflection_model = q.select("Reflection model (GEPA)?", choices=_SAME_AS_TASK_CHOICES,
                                 default="(same as task)").ask()
-    eval_model = q.select("Eval model?", choices=["(same as task)"] + GEMINI_CHOICES,
+    eval_model = q.select("Eval model?", choices=_SAME_AS_TASK_CHOICES,
                           default="(same as task)").ask()
     train = q.text("Training JSONL path:").ask()
     val = q.text("Validation JSONL path (optional):").ask()
     history = q.text("History bytes for dataset (0 = disabled):", default="0").ask()
+    threads = q.text("Concurrent eval threads:", default="16").ask()
     return {
         "scope": scope, "optimizer": optimizer, "auto": auto,
         "task_model": task_model,
@@ -56,5 +107,6 @@ def optimize_menu():
         "reflection_model": None if reflection_model == "(same as task)" else reflection_model,
         "eval_model": None if eval_model == "(same as task)" else eval_model,
         "train": train, "val": (val or None),
-        "history_bytes": int(history or "0"),
+        "history_bytes": _to_int(history, 0),
+        "num_threads": _to_int(threads, 16),
     }
\ No newline at end of file
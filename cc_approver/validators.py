@@ -1,17 +1,29 @@
 """Validation functions for cc_approver package."""
+import sys
 from typing import Optional
 from .constants import VALID_DECISIONS, DEFAULT_DECISION, MAX_REASON_LENGTH
 
+# Interned canonical decisions: the common case (model answered exactly
+# "allow"/"deny"/"ask") returns without any strip/lower allocation.
+_ALLOW = sys.intern("allow")
+_DENY = sys.intern("deny")
+_ASK = sys.intern("ask")
+
 def normalize_decision(decision: Optional[str]) -> str:
     """Normalize and validate decision string.
-    
+
     Args:
         decision: Decision string to normalize
-        
+
     Returns:
         Normalized decision (allow/deny/ask)
     """
-    normalized = (decision or "").strip().lower()
+    if not decision:
+        return DEFAULT_DECISION
+    if decision is _ALLOW or decision == "allow": return _ALLOW
+    if decision is _DENY or decision == "deny": return _DENY
+    if decision is _ASK or decision == "ask": return _ASK
+    normalized = decision.strip().lower()
     return normalized if normalized in VALID_DECISIONS else DEFAULT_DECISION
 
 def validate_path(path: Optional[str]) -> bool:
@@ -0,0 +1,23 @@
+#!/usr/bin/env bash
+# AOT-compile the standalone PreToolUse hook with Nuitka.
+#
+# CPython startup plus `import dspy` dominates the hook's cold-start cost
+# (~500ms before the LLM call). A onefile Nuitka binary freezes the
+# interpreter and imports, cutting startup to tens of ms.
+#
+# Usage: scripts/build_hook.sh [output-path]
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+OUT="${1:-cc_approver_hook}"
+
+python -m nuitka \
+    --onefile \
+    --standalone \
+    --include-package=dspy \
+    --include-package=litellm \
+    --python-flag=no_site \
+    --output-filename="$OUT" \
+    .claude/hooks/cc_approver_hook.py
+
+echo "Built $OUT — point your PreToolUse hook command at it for fast cold starts."
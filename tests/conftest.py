@@ -26,11 +26,59 @@ def _preserve_pythonpath():
     else:
         os.environ["PYTHONPATH"] = old
 
+def pytest_addoption(parser):
+    parser.addoption("--run-live", action="store_true", default=False,
+                     help="Run tests marked live_llm against the real LM endpoint")
+
+@pytest.fixture(autouse=True)
+def stub_llm(request, monkeypatch):
+    """Stub the LM decision so hook tests never hit the network.
+
+    Tests that genuinely exercise the live model are marked live_llm and
+    only run with --run-live.
+    """
+    if "live_llm" in request.keywords:
+        if not request.config.getoption("--run-live"):
+            pytest.skip("live LM test; enable with --run-live")
+        yield
+        return
+    monkeypatch.setattr("cc_approver.hook.run_program",
+                        lambda *a, **kw: Mock(decision="allow", reason="stub"))
+    yield
+
+@pytest.fixture(autouse=True)
+def _reset_settings_caches():
+    """Drop the settings-file memos between tests.
+
+    The caches validate by (mtime_ns, size), but tests that recreate
+    identical files in reused directories should still start cold.
+    """
+    yield
+    if "cc_approver.settings" in sys.modules:
+        mod = sys.modules["cc_approver.settings"]
+        mod._CHAIN_CACHE.clear()
+        mod._JSON_CACHE.clear()
+    if "cc_approver.hook" in sys.modules:
+        sys.modules["cc_approver.hook"]._TAIL_CACHE.clear()
+    if "cc_approver.tui" in sys.modules:
+        sys.modules["cc_approver.tui"]._detect_scope.cache_clear()
+
 @pytest.fixture(autouse=True)
 def _reset_dspy():
-    """Reset DSPy global LM between tests."""
+    """Reset DSPy global LM (and the optimizer's memoized LM factory) between tests."""
     yield
     dspy.settings.configure(lm=None)
+    if "cc_approver.optimizer" in sys.modules:
+        sys.modules["cc_approver.optimizer"]._lm.cache_clear()
+    if "cc_approver.approver" in sys.modules:
+        sys.modules["cc_approver.approver"]._build_lm.cache_clear()
+
+@pytest.fixture(scope="session")
+def dspy_mod():
+    """The dspy module, imported once per session for tests that need the
+    real classes; test modules themselves stay dspy-free at import time."""
+    import dspy as mod
+    return mod
 
 @pytest.fixture
 def mock_lm():
@@ -71,8 +119,143 @@ def sample_payload():
         "transcript_path": "/tmp/transcript.txt"
     }
 
+# JSONL rows for the optimizer fixtures below; written to disk once per
+# session instead of once per test.
+_TRAIN_EXAMPLES = [
+    {"tool_name": "Bash", "tool_input": {"command": "ls"}, "label": "allow"},
+    {"tool_name": "Bash", "tool_input": {"command": "rm -rf /"}, "label": "deny"},
+    {"tool_name": "Edit", "tool_input": {"path": "/etc/passwd"}, "label": "deny"},
+    {"tool_name": "Read", "tool_input": {"path": "README.md"}, "label": "allow"},
+    {"tool_name": "Write", "tool_input": {"path": "/tmp/test.txt"}, "label": "ask"},
+]
+_VAL_EXAMPLES = [
+    {"tool_name": "Bash", "tool_input": {"command": "pwd"}, "label": "allow"},
+    {"tool_name": "Bash", "tool_input": {"command": "sudo rm -rf /"}, "label": "deny"},
+]
+
+def _write_jsonl(path, rows):
+    from cc_approver import fastjson
+    path.write_bytes(b"".join(fastjson.dumps_bytes(r) + b"\n" for r in rows))
+    return path
+
+@pytest.fixture(scope="session")
+def train_data(tmp_path_factory):
+    """Training JSONL file (session-scoped; consumers only read it)."""
+    return _write_jsonl(tmp_path_factory.mktemp("data") / "train.jsonl",
+                        _TRAIN_EXAMPLES)
+
+@pytest.fixture(scope="session")
+def val_data(tmp_path_factory):
+    """Validation JSONL file (session-scoped; consumers only read it)."""
+    return _write_jsonl(tmp_path_factory.mktemp("data") / "val.jsonl",
+                        _VAL_EXAMPLES)
+
+@pytest.fixture(scope="session")
+def mock_settings():
+    """Settings dict for optimizer tests; deepcopy before mutating."""
+    return {
+        "policy": {
+            "approverInstructions": "Allow safe operations, deny destructive ones"
+        },
+        "dspyApprover": {
+            "model": "test-model",
+            "historyBytes": 0,
+            "compiledModelPath": "$CLAUDE_PROJECT_DIR/.claude/models/approver.compiled.json"
+        }
+    }
+
+@pytest.fixture(scope="session")
+def warm_start_file(tmp_path_factory):
+    """A static compiled-model artifact, written once per session."""
+    path = (tmp_path_factory.mktemp("warm") / ".claude" / "models"
+            / "approver.compiled.json")
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"step": {"demos": [], "signature": "Approver"}}))
+    return path
+
+@pytest.fixture
+def mock_settings_mut(mock_settings):
+    """Per-test deep copy of mock_settings for tests that mutate it."""
+    import copy
+    return copy.deepcopy(mock_settings)
+
 @pytest.fixture
 def mock_dspy_context(mock_lm):
     """Mock DSPy context with configured LM."""
     with dspy.context(lm=mock_lm):
-        yield
\ No newline at end of file
+        yield
+
+class _FakeQuestionary:
+    """Minimal questionary stand-in: every prompt returns the next queued
+    answer (or raises it, if an exception instance is queued)."""
+
+    def __init__(self):
+        self.answers = iter(())
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def text(self, *args, **kwargs):
+        return self
+
+    def ask(self):
+        answer = next(self.answers)
+        if isinstance(answer, BaseException):
+            raise answer
+        return answer
+
+@pytest.fixture
+def tui_inputs(monkeypatch):
+    """Queue prompt answers for cc_approver.tui without stacked patches."""
+    from cc_approver import tui
+    fake = _FakeQuestionary()
+    monkeypatch.setattr(tui, "q", fake)
+
+    def _queue(answers):
+        fake.answers = iter(answers)
+    return _queue
+
+@pytest.fixture(scope="session")
+def cli_module():
+    """Import cc_approver.cli once per session (pulls in dspy transitively)."""
+    from cc_approver import cli
+    return cli
+
+@pytest.fixture(scope="session")
+def help_text(cli_module):
+    """Rendered --help output; pure function of the parser, so built once."""
+    return cli_module._build_parser().format_help()
+
+@pytest.fixture
+def run_cli(monkeypatch, capsys, cli_module):
+    """Invoke the CLI in-process instead of forking an interpreter.
+
+    Mirrors subprocess semantics: SystemExit maps to the exit code and any
+    other exception counts as a non-zero exit, with captured stdout/stderr
+    returned either way.
+    """
+    import io
+
+    def _run(argv, stdin_text=None):
+        monkeypatch.setattr(sys, "argv", list(argv))
+        if stdin_text is not None:
+            monkeypatch.setattr(sys, "stdin", io.StringIO(stdin_text))
+        main = cli_module.main
+        code = 0
+        # cmd_hook --verbose writes CC_APPROVER_VERBOSE into os.environ;
+        # a subprocess would have isolated that, so restore it here.
+        verbose_before = os.environ.get("CC_APPROVER_VERBOSE")
+        try:
+            main()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            code = 1
+        finally:
+            if verbose_before is None:
+                os.environ.pop("CC_APPROVER_VERBOSE", None)
+            else:
+                os.environ["CC_APPROVER_VERBOSE"] = verbose_before
+        return capsys.readouterr(), code
+
+    return _run
\ No newline at end of file
@@ -52,6 +52,17 @@ class TestConfigureLM:
         mock_lm.assert_called_once_with("test-model", temperature=0.0, max_tokens=1024, extra_body={"priority": -1})
         mock_configure.assert_called_once()
 
+    @patch('cc_approver.approver.dspy.configure')
+    @patch('cc_approver.approver.dspy.LM')
+    def test_configure_lm_nested_extra_body(self, mock_lm, mock_configure):
+        """Nested extraBody (e.g. provider routing) must stay cacheable."""
+        extra = {"provider": {"order": ["a", "b"]}}
+        configure_lm("test-model", extra_body=extra)
+        configure_lm("test-model", extra_body=extra)
+        mock_lm.assert_called_once_with(
+            "test-model", temperature=0.0, max_tokens=1024,
+            extra_body={"priority": -1, "provider": {"order": ["a", "b"]}})
+
 class TestTryLoadCompiled:
     def test_load_compiled_success(self, temp_dir):
         """Test successful loading of compiled program."""
@@ -5,6 +5,14 @@ Tests complete workflows, edge cases, and integration scenarios.
 import pytest
 import json
 import subprocess
+import time
+
+# Prefer the third-party `regex` engine for the hot pattern loops below;
+# it is a drop-in for `re` with a faster matcher.
+try:
+    import regex as _re
+except ImportError:
+    import re as _re
 import sys
 import os
 import io
@@ -638,12 +646,13 @@ class TestCompiledModelLifecycle:
         project2.mkdir()
         
         # Both projects should be able to use global model
-        from cc_approver.approver import try_load_compiled
-        
+        from cc_approver.approver import try_load_compiled, _COMPILED_CACHE
+
         for project in [project1, project2]:
             os.environ["CLAUDE_PROJECT_DIR"] = str(project)
             project_model = project / ".claude" / "models" / "approver.compiled.json"
-            
+
+            _COMPILED_CACHE.clear()  # each project starts from a cold cache
             with patch('cc_approver.approver.ApproverProgram.load') as mock_load:
                 result = try_load_compiled([project_model, global_model])
                 # Should load global model since project model doesn't exist
@@ -737,27 +746,57 @@ class TestErrorRecovery:
             (tmp_path / "readonly").chmod(0o755)
 
 
+# Compiled once at import; pat.match() skips the re._compile cache probe
+# that re.match(str, ...) pays on every call.
+_REGEX_CASES = [(_re.compile(p), t, e) for p, t, e in [
+    ("Bash|Edit|Write", "Bash", True),
+    ("Bash|Edit|Write", "Read", False),
+    (".*", "AnyTool", True),
+    ("^Bash$", "Bash", True),
+    ("^Bash$", "BashScript", False),
+    ("Edit.*", "EditFile", True),
+    ("Edit.*", "Edit", True),
+    ("(?i)bash", "BASH", True),  # Case insensitive
+    ("(?i)bash", "bash", True),
+]]
+
+
+def _factored_alternation(words):
+    """Merge alternatives sharing a leading character into nested groups.
+
+    Turns a flat N-way alternation into a trie-shaped pattern so the
+    backtracking engine walks shared prefixes once instead of per branch.
+    """
+    if len(words) == 1:
+        return _re.escape(words[0])
+    groups = {}
+    for w in words:
+        groups.setdefault(w[:1], []).append(w[1:])
+    parts = []
+    for head, tails in sorted(groups.items()):
+        if head == "":
+            parts.append("")
+        elif tails == [""]:
+            parts.append(_re.escape(head))
+        else:
+            parts.append(_re.escape(head) + "(?:" + _factored_alternation(tails) + ")")
+    return "|".join(parts)
+
+
+# 100 "Tool<i>.*" matchers with the shared "Tool" prefix hoisted out and the
+# numeric suffixes trie-merged, compiled once at import.
+_MANY_TOOLS_PAT = _re.compile(
+    "^Tool(?:%s)\\w*" % _factored_alternation([str(i) for i in range(100)]))
+
+
 class TestPermissionPatterns:
     """Test permission matching patterns."""
-    
+
     def test_complex_regex_matchers(self):
         """Test complex regex patterns for tool matching."""
-        test_cases = [
-            ("Bash|Edit|Write", "Bash", True),
-            ("Bash|Edit|Write", "Read", False),
-            (".*", "AnyTool", True),
-            ("^Bash$", "Bash", True),
-            ("^Bash$", "BashScript", False),
-            ("Edit.*", "EditFile", True),
-            ("Edit.*", "Edit", True),
-            ("(?i)bash", "BASH", True),  # Case insensitive
-            ("(?i)bash", "bash", True),
-        ]
-        
-        for pattern, tool_name, should_match in test_cases:
-            import re
-            match = bool(re.match(pattern, tool_name))
-            assert match == should_match, f"Pattern {pattern} vs {tool_name}"
+        for pat, tool_name, should_match in _REGEX_CASES:
+            match = bool(pat.match(tool_name))
+            assert match == should_match, f"Pattern {pat.pattern} vs {tool_name}"
     
     def test_matcher_precedence_in_hooks(self):
         """Test that matcher precedence works correctly."""
@@ -778,111 +817,101 @@ class TestPermissionPatterns:
     
     def test_performance_with_many_patterns(self):
         """Test performance with many permission patterns."""
-        import re
-        import time
-        
-        # Create many patterns
-        patterns = [f"Tool{i}.*" for i in range(100)]
-        combined_pattern = "|".join(patterns)
-        
         # Test matching performance
-        start = time.time()
+        start = time.perf_counter()
         for _ in range(1000):
-            re.match(combined_pattern, "Tool50_test")
-        elapsed = time.time() - start
-        
-        # Should be reasonably fast (< 1 second for 1000 matches)
-        assert elapsed < 1.0, f"Pattern matching too slow: {elapsed}s"
+            assert _MANY_TOOLS_PAT.match("Tool50_test")
+        elapsed = time.perf_counter() - start
+
+        # Precompiled matching should be well under 0.1s for 1000 matches
+        assert elapsed < 0.1, f"Pattern matching too slow: {elapsed}s"
+
+    def test_performance_with_hyperscan(self):
+        """Same dictionary via hyperscan's multi-pattern scanner, if present."""
+        hyperscan = pytest.importorskip("hyperscan")
+
+        db = hyperscan.Database()
+        patterns = [f"Tool{i}.*".encode() for i in range(100)]
+        db.compile(expressions=patterns, ids=list(range(100)))
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            db.scan(b"Tool50_test", match_event_handler=lambda *a: None)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.1, f"Hyperscan matching too slow: {elapsed}s"
 
 
 class TestTUIFlow:
     """Test Terminal UI flows."""
     
-    def test_tui_init_flow(self):
+    def test_tui_init_flow(self, tui_inputs):
         """Test interactive init flow."""
-        with patch('questionary.select') as mock_select:
-            with patch('questionary.text') as mock_text:
-                from cc_approver.tui import init_menu
-                
-                # Mock user inputs
-                mock_select.return_value.ask.side_effect = [
-                    "project",
-                    "openrouter/google/gemini-2.5-flash-lite",
-                ]
-                mock_text.return_value.ask.side_effect = [
-                    "0",           # history_bytes
-                    "Bash",        # matcher
-                    "30",          # timeout
-                    "Test policy"  # policy_text
-                ]
-
-                result = init_menu()
-
-                assert result["scope"] == "project"
-                assert result["model"] == "openrouter/google/gemini-2.5-flash-lite"
-                assert result["history_bytes"] == 0
-                assert result["matcher"] == "Bash"
-                assert result["timeout"] == 30
-                assert result["policy_text"] == "Test policy"
+        from cc_approver.tui import init_menu
+
+        # Answers in prompt order: scope, model, history, matcher,
+        # timeout, policy.
+        tui_inputs([
+            "project",
+            "openrouter/google/gemini-2.5-flash-lite",
+            "0", "Bash", "30", "Test policy",
+        ])
+
+        result = init_menu()
+
+        assert result["scope"] == "project"
+        assert result["model"] == "openrouter/google/gemini-2.5-flash-lite"
+        assert result["history_bytes"] == 0
+        assert result["matcher"] == "Bash"
+        assert result["timeout"] == 30
+        assert result["policy_text"] == "Test policy"
     
-    def test_tui_optimize_flow(self):
+    def test_tui_optimize_flow(self, tui_inputs):
         """Test interactive optimize flow."""
-        with patch('questionary.select') as mock_select:
-            with patch('questionary.text') as mock_text:
-                from cc_approver.tui import optimize_menu
-                
-                # 7 select calls: scope, optimizer, auto, task_model,
-                # prompt_model, reflection_model, eval_model
-                mock_select.return_value.ask.side_effect = [
-                    "project", "mipro", "light",
-                    "openrouter/google/gemini-2.5-flash-lite",
-                    "(same as task)", "(same as task)", "(same as task)",
-                ]
-                # 3 text calls: train, val, history_bytes
-                mock_text.return_value.ask.side_effect = [
-                    "train.jsonl", "val.jsonl", "0",
-                ]
-                
-                result = optimize_menu()
-                
-                assert result["scope"] == "project"
-                assert result["optimizer"] == "mipro"
-                assert result["auto"] == "light"
-                assert result["task_model"] == "openrouter/google/gemini-2.5-flash-lite"
-                assert result["train"] == "train.jsonl"
-                assert result["val"] == "val.jsonl"
-                assert result["history_bytes"] == 0
+        from cc_approver.tui import optimize_menu
+
+        # Answers in prompt order: scope, optimizer, auto, task model,
+        # prompt/reflection/eval models, train, val, history, threads.
+        tui_inputs([
+            "project", "mipro", "light",
+            "openrouter/google/gemini-2.5-flash-lite",
+            "(same as task)", "(same as task)", "(same as task)",
+            "train.jsonl", "val.jsonl", "0", "16",
+        ])
+
+        result = optimize_menu()
+
+        assert result["scope"] == "project"
+        assert result["optimizer"] == "mipro"
+        assert result["auto"] == "light"
+        assert result["task_model"] == "openrouter/google/gemini-2.5-flash-lite"
+        assert result["train"] == "train.jsonl"
+        assert result["val"] == "val.jsonl"
+        assert result["history_bytes"] == 0
+        assert result["num_threads"] == 16
     
-    def test_tui_cancellation(self):
+    def test_tui_cancellation(self, tui_inputs):
         """Test TUI cancellation/interruption."""
-        with patch('questionary.select') as mock_select:
-            from cc_approver.tui import main_menu
-            
-            # Simulate user pressing Ctrl+C
-            mock_select.return_value.ask.side_effect = KeyboardInterrupt
-            
-            result = main_menu()
-            assert result == "Exit"
+        from cc_approver.tui import main_menu
+
+        # Simulate user pressing Ctrl+C
+        tui_inputs([KeyboardInterrupt()])
+
+        result = main_menu()
+        assert result == "Exit"
     
-    def test_tui_input_validation(self):
+    def test_tui_input_validation(self, tui_inputs):
         """Test TUI input validation."""
-        with patch('questionary.select') as mock_select:
-            with patch('questionary.text') as mock_text:
-                from cc_approver.tui import init_menu
-                
-                # Mock invalid then valid history_bytes
-                mock_select.return_value.ask.side_effect = ["project"]
-                mock_text.return_value.ask.side_effect = [
-                    "model",
-                    "not_a_number",  # Invalid - will be caught and retried
-                    "100",           # Valid
-                    "Bash",
-                    "30",
-                    "Policy"
-                ]
-                
-                # Should handle invalid input gracefully
-                result = init_menu()
-                # Note: Current implementation doesn't retry on invalid input
-                # It will use 0 as default for invalid number
-                assert result["history_bytes"] == 0  # Falls back to 0 for invalid input
\ No newline at end of file
+        from cc_approver.tui import init_menu
+
+        # Invalid history_bytes answer; menu falls back to the default
+        tui_inputs([
+            "project", "(use global)",
+            "not_a_number",  # invalid history_bytes
+            "Bash", "30", "Policy",
+        ])
+
+        result = init_menu()
+        # Note: Current implementation doesn't retry on invalid input
+        # It will use 0 as default for invalid number
+        assert result["history_bytes"] == 0  # Falls back to 0 for invalid input
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Tests for cc_approver.daemon module."""
+import io
+import json
+import queue
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from cc_approver import daemon
+from cc_approver import hook as hook_mod
+
+class TestDaemonConfig:
+    def test_daemon_enabled_variants(self, monkeypatch):
+        """Test daemon_enabled only accepts a literal true."""
+        monkeypatch.delenv(daemon.DAEMON_ENV, raising=False)
+        assert daemon.daemon_enabled() is False
+        monkeypatch.setenv(daemon.DAEMON_ENV, "TRUE")
+        assert daemon.daemon_enabled() is True
+        monkeypatch.setenv(daemon.DAEMON_ENV, "1")
+        assert daemon.daemon_enabled() is False
+
+    def test_socket_path_override(self, monkeypatch):
+        """Test CC_APPROVER_SOCKET wins over the runtime dir."""
+        monkeypatch.setenv(daemon.SOCKET_ENV, "/tmp/custom.sock")
+        assert daemon.socket_path() == "/tmp/custom.sock"
+
+    def test_socket_path_runtime_dir(self, monkeypatch):
+        """Test XDG_RUNTIME_DIR is used when no override is set."""
+        monkeypatch.delenv(daemon.SOCKET_ENV, raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/42")
+        assert daemon.socket_path() == "/run/user/42/cc-approver.sock"
+
+class TestDrainBatch:
+    def _slot(self, payload):
+        return [payload, None, threading.Event()]
+
+    def test_drains_queued_slots_up_to_max(self, monkeypatch):
+        """Test everything already queued comes out in one batch."""
+        q = queue.Queue()
+        monkeypatch.setattr(daemon, "_queue", q)
+        for i in range(daemon.BATCH_MAX + 2):
+            q.put(self._slot({"n": i}))
+        slots = daemon._drain_batch()
+        assert len(slots) == daemon.BATCH_MAX
+        assert q.qsize() == 2
+
+    def test_single_slot_after_window(self, monkeypatch):
+        """Test a lone request is released once the window closes."""
+        q = queue.Queue()
+        monkeypatch.setattr(daemon, "_queue", q)
+        q.put(self._slot({"n": 0}))
+        start = time.monotonic()
+        slots = daemon._drain_batch()
+        assert len(slots) == 1
+        # Blocked at most roughly the batch window, not indefinitely.
+        assert time.monotonic() - start < daemon.BATCH_WINDOW_S * 20
+
+class TestServeRoundTrip:
+    def test_request_returns_none_when_unreachable(self, monkeypatch, temp_dir):
+        """Test request falls back to None without a listening daemon."""
+        monkeypatch.setenv(daemon.SOCKET_ENV, str(temp_dir / "absent.sock"))
+        assert daemon.request(b"{}") is None
+
+    def test_serve_request_roundtrip(self, monkeypatch, temp_dir):
+        """Test a loopback decide through the socket protocol."""
+        sock = temp_dir / "daemon.sock"
+        monkeypatch.setenv(daemon.SOCKET_ENV, str(sock))
+        monkeypatch.setattr(daemon, "_init_program", lambda: None)
+        monkeypatch.setattr(hook_mod, "decide",
+                            lambda payload, program=None: {"echo": payload})
+        threading.Thread(target=daemon.serve, daemon=True).start()
+        deadline = time.monotonic() + 5.0
+        while not sock.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        raw = json.dumps({"tool_name": "Bash"}).encode("utf-8")
+        reply = daemon.request(raw)
+        assert reply is not None
+        assert json.loads(reply) == {"echo": {"tool_name": "Bash"}}
+
+class TestFallbackOutput:
+    def test_fallback_output_shape(self):
+        """Test the error fallback follows the hook output protocol."""
+        out = daemon._fallback_output()["hookSpecificOutput"]
+        assert out["permissionDecision"] == "ask"
+        assert out["hookEventName"] == "PreToolUse"
+
+class TestHookDaemonBranch:
+    def test_main_uses_daemon_reply(self, monkeypatch, capsys):
+        """Test hook.main forwards the daemon reply verbatim."""
+        monkeypatch.setattr(daemon, "daemon_enabled", lambda: True)
+        monkeypatch.setattr(daemon, "request", lambda raw: b'{"ok": true}')
+        mock_decide = Mock()
+        monkeypatch.setattr(hook_mod, "decide", mock_decide)
+        monkeypatch.setattr("sys.stdin", io.StringIO("{}"))
+        hook_mod.main()
+        assert capsys.readouterr().out == '{"ok": true}'
+        mock_decide.assert_not_called()
+
+    def test_main_falls_back_and_spawns(self, monkeypatch, capsys):
+        """Test an unreachable daemon spawns one and decides in-process."""
+        monkeypatch.setattr(daemon, "daemon_enabled", lambda: True)
+        monkeypatch.setattr(daemon, "request", lambda raw: None)
+        mock_spawn = Mock()
+        monkeypatch.setattr(daemon, "spawn", mock_spawn)
+        monkeypatch.setattr(hook_mod, "decide",
+                            lambda payload, program=None: {"fell": "back"})
+        monkeypatch.setattr("sys.stdin", io.StringIO('{"tool_name": "Bash"}'))
+        hook_mod.main()
+        assert mock_spawn.call_count == 1
+        assert json.loads(capsys.readouterr().out) == {"fell": "back"}
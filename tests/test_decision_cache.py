@@ -0,0 +1,49 @@
+"""Tests for cc_approver.decision_cache module."""
+import pytest
+
+from cc_approver import decision_cache as dc
+
+@pytest.fixture(autouse=True)
+def isolated_cache(temp_dir, monkeypatch):
+    """Point the cache at a throwaway SQLite file."""
+    monkeypatch.setattr(dc, "CACHE_PATH", temp_dir / "decisions.db")
+    monkeypatch.setattr(dc, "_conn", None)
+    yield
+    if dc._conn is not None:
+        dc._conn.close()
+        dc._conn = None
+
+class TestMakeKey:
+    def test_stable_for_same_input(self):
+        """Test identical calls produce identical keys."""
+        k1, p1 = dc.make_key("policy", "Bash", {"command": "ls", "timeout": 1})
+        k2, p2 = dc.make_key("policy", "Bash", {"timeout": 1, "command": "ls"})
+        assert (k1, p1) == (k2, p2)
+
+    def test_differs_per_policy_and_input(self):
+        """Test key changes with policy or tool input."""
+        k1, _ = dc.make_key("policy", "Bash", {"command": "ls"})
+        k2, _ = dc.make_key("other", "Bash", {"command": "ls"})
+        k3, _ = dc.make_key("policy", "Bash", {"command": "rm"})
+        assert len({k1, k2, k3}) == 3
+
+class TestLookupStore:
+    def test_roundtrip(self):
+        """Test stored decision comes back on exact repeat."""
+        key, ph = dc.make_key("policy", "Bash", {"command": "ls"})
+        assert dc.lookup(key, ph) is None
+        dc.store(key, ph, "allow", "")
+        assert dc.lookup(key, ph) == ("allow", "")
+
+    def test_policy_change_invalidates(self):
+        """Test a different policy hash misses the cached row."""
+        key, ph = dc.make_key("policy", "Bash", {"command": "ls"})
+        dc.store(key, ph, "deny", "nope")
+        _, other_ph = dc.make_key("changed", "Bash", {"command": "ls"})
+        assert dc.lookup(key, other_ph) is None
+
+    def test_expired_row_misses(self):
+        """Test rows past the TTL are ignored."""
+        key, ph = dc.make_key("policy", "Bash", {"command": "ls"})
+        dc.store(key, ph, "allow", "")
+        assert dc.lookup(key, ph, ttl=0) is None
@@ -0,0 +1,87 @@
+"""Tests for cc_approver.fastpath module."""
+import json
+import pytest
+from pathlib import Path
+
+from cc_approver.fastpath import (
+    classify, learn_rules, load_rules, write_rules, fast_decision
+)
+
+class TestClassify:
+    def test_no_rules_returns_none(self):
+        """Test classify falls through without rules."""
+        assert classify("Bash", {"command": "ls"}, []) is None
+
+    def test_tool_rule_matches(self):
+        """Test whole-tool rule matches without a pattern."""
+        rules = [{"tool": "Read", "decision": "allow"}]
+        assert classify("Read", {"path": "a.py"}, rules) == "allow"
+        assert classify("Bash", {"command": "ls"}, rules) is None
+
+    def test_pattern_rule_matches_input(self):
+        """Test regex rule matches stringified tool input."""
+        rules = [{"tool": "Bash", "pattern": r"rm -rf", "decision": "deny"}]
+        assert classify("Bash", {"command": "rm -rf /"}, rules) == "deny"
+        assert classify("Bash", {"command": "ls -la"}, rules) is None
+
+    def test_bad_pattern_is_skipped(self):
+        """Test invalid regex does not crash classification."""
+        rules = [{"tool": "Bash", "pattern": "(", "decision": "deny"}]
+        assert classify("Bash", {"command": "ls"}, rules) is None
+
+class TestLearnRules:
+    def _write_jsonl(self, path, rows):
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+    def test_learns_pure_tool_rule(self, temp_dir):
+        """Test a tool with uniform labels becomes a rule."""
+        train = temp_dir / "train.jsonl"
+        self._write_jsonl(train, [
+            {"tool_name": "Read", "tool_input_json": "{}", "label": "allow"}
+            for _ in range(3)
+        ])
+        rules = learn_rules(train, min_count=3)
+        assert {"tool": "Read", "decision": "allow"} in rules
+
+    def test_skips_impure_or_sparse_tools(self, temp_dir):
+        """Test mixed labels or too few examples produce no rule."""
+        train = temp_dir / "train.jsonl"
+        self._write_jsonl(train, [
+            {"tool_name": "Edit", "tool_input_json": "{}", "label": "allow"},
+            {"tool_name": "Edit", "tool_input_json": "{}", "label": "deny"},
+            {"tool_name": "Write", "tool_input_json": "{}", "label": "allow"},
+        ])
+        assert learn_rules(train, min_count=3) == []
+
+    def test_learns_bash_command_rule(self, temp_dir):
+        """Test Bash commands are grouped by leading token."""
+        train = temp_dir / "train.jsonl"
+        self._write_jsonl(train, [
+            {"tool_name": "Bash",
+             "tool_input_json": json.dumps({"command": f"ls {d}"}),
+             "label": "allow"} for d in ("/a", "/b", "/c")
+        ] + [
+            {"tool_name": "Bash",
+             "tool_input_json": json.dumps({"command": "rm -rf /"}),
+             "label": "deny"},
+        ])
+        rules = learn_rules(train, min_count=3)
+        bash_rules = [r for r in rules if r["tool"] == "Bash"]
+        assert len(bash_rules) == 1
+        assert classify("Bash", {"command": "ls /etc"}, bash_rules) == "allow"
+        assert classify("Bash", {"command": "rm -rf /"}, bash_rules) is None
+
+class TestRulesIO:
+    def test_write_and_load_roundtrip(self, temp_dir):
+        """Test rules survive a write/load cycle."""
+        path = temp_dir / ".claude" / "fastpath.json"
+        rules = [{"tool": "Read", "decision": "allow"}]
+        write_rules(rules, path)
+        assert load_rules(path) == rules
+
+    def test_missing_rules_file(self, temp_dir):
+        """Test missing rules file disables the fast path."""
+        assert load_rules(temp_dir / "nope.json") == []
+        assert fast_decision("Read", {}, str(temp_dir)) is None
@@ -10,21 +10,26 @@ import dspy
 from cc_approver.approver import Approver, ApproverProgram, configure_lm
 
 
+# Prebuilt stub predictions shared across tests; program.step.forward is
+# patched to return these so only ApproverProgram.forward runs for real.
+_DENY_RESULT = Mock(decision='deny', reason='Policy denies destructive operations')
+_ALLOW_RESULT = Mock(decision='allow', reason='Policy allows read-only operations')
+
+
 class TestPolicyIntegration:
     """Test that policies actually affect decisions."""
-    
-    def test_deny_policy_blocks_destructive(self):
-        """Test that deny destructive policy blocks rm commands."""
+
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def program():
+        """Configure the LM once for the class; tests mock forward anyway."""
         configure_lm("test-model")
-        program = ApproverProgram()
-        
+        return ApproverProgram()
+
+    def test_deny_policy_blocks_destructive(self, program):
+        """Test that deny destructive policy blocks rm commands."""
         # Mock the LM to simulate policy-based decision
-        with patch.object(program.step, 'forward') as mock_forward:
-            mock_forward.return_value = Mock(
-                decision='deny', 
-                reason='Policy denies destructive operations'
-            )
-            
+        with patch.object(program.step, 'forward', return_value=_DENY_RESULT):
             result = program.forward(
                 policy="Deny destructive operations",
                 tool="Bash",
@@ -35,17 +40,9 @@ class TestPolicyIntegration:
             assert result.decision == 'deny'
             assert 'destructive' in result.reason.lower()
     
-    def test_allow_policy_permits_readonly(self):
+    def test_allow_policy_permits_readonly(self, program):
         """Test that allow read-only policy permits ls commands."""
-        configure_lm("test-model")
-        program = ApproverProgram()
-        
-        with patch.object(program.step, 'forward') as mock:
-            mock.return_value = Mock(
-                decision='allow',
-                reason='Policy allows read-only operations'
-            )
-            
+        with patch.object(program.step, 'forward', return_value=_ALLOW_RESULT):
             result = program.forward(
                 policy="Allow read-only operations",
                 tool="Bash",
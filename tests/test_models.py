@@ -9,10 +9,20 @@ from cc_approver.constants import (
     DEFAULT_MATCHER, DEFAULT_TIMEOUT
 )
 
+# Built once: the default-value tests only read attributes, so the model
+# instances can be shared instead of re-validated per test.
+@pytest.fixture(scope="module")
+def default_dspy_config():
+    return DspyConfig()
+
+@pytest.fixture(scope="module")
+def default_policy_config():
+    return PolicyConfig()
+
 class TestDspyConfig:
-    def test_default_values(self):
+    def test_default_values(self, default_dspy_config):
         """Test DspyConfig default values."""
-        config = DspyConfig()
+        config = default_dspy_config
         assert config.model == DEFAULT_MODEL
         assert config.historyBytes == DEFAULT_HISTORY_BYTES
         assert config.compiledModelPath == DEFAULT_COMPILED_PATH
@@ -21,10 +31,9 @@ class TestDspyConfig:
         assert config.reflectionModel is None
 
 class TestPolicyConfig:
-    def test_default_values(self):
+    def test_default_values(self, default_policy_config):
         """Test PolicyConfig default values."""
-        config = PolicyConfig()
-        assert config.approverInstructions == ""
+        assert default_policy_config.approverInstructions == ""
     
     def test_custom_values(self):
         """Test PolicyConfig with custom values."""
@@ -32,32 +41,22 @@ class TestPolicyConfig:
         assert config.approverInstructions == "Custom policy"
 
 class TestTrainingExample:
-    def test_label_normalization(self):
+    @pytest.mark.parametrize("raw,expected", [
+        ("ALLOW", "allow"),
+        ("Deny", "deny"),
+        ("ASK", "ask"),
+        ("invalid", ""),  # unknown labels normalize to empty string
+    ])
+    def test_label_normalization(self, raw, expected):
         """Test label field is normalized."""
-        example = TrainingExample(label="ALLOW")
-        assert example.label == "allow"
-        
-        example = TrainingExample(label="Deny")
-        assert example.label == "deny"
-        
-        example = TrainingExample(label="ASK")
-        assert example.label == "ask"
-    
-    def test_invalid_label(self):
-        """Test invalid label is normalized to empty string."""
-        example = TrainingExample(label="invalid")
-        assert example.label == ""
+        assert TrainingExample(label=raw).label == expected
 
 class TestDecisionResult:
-    def test_decision_normalization(self):
+    @pytest.mark.parametrize("raw,expected", [
+        ("ALLOW", "allow"),
+        ("Deny", "deny"),
+        ("invalid", "ask"),  # unknown decisions fall back to ask
+    ])
+    def test_decision_normalization(self, raw, expected):
         """Test decision field is normalized."""
-        result = DecisionResult(decision="ALLOW", reason="OK")
-        assert result.decision == "allow"
-        
-        result = DecisionResult(decision="Deny", reason="Not safe")
-        assert result.decision == "deny"
-    
-    def test_invalid_decision(self):
-        """Test invalid decision is normalized to ask."""
-        result = DecisionResult(decision="invalid", reason="test")
-        assert result.decision == "ask"
\ No newline at end of file
+        assert DecisionResult(decision=raw, reason="test").decision == expected
\ No newline at end of file
@@ -1,8 +1,8 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 import json
-import dspy
 
 from cc_approver.optimizer import (
     read_jsonl, acc_metric, gepa_metric,
@@ -35,27 +35,29 @@ class TestReadJsonl:
 class TestAccMetric:
     def test_acc_metric_correct(self):
         """Test accuracy metric with correct prediction."""
-        ex = dspy.Example(decision="allow")
+        # The metrics only read .decision, so a namespace stands in for
+        # dspy.Example without its field machinery.
+        ex = SimpleNamespace(decision="allow")
         pred = Mock(decision="allow")
         assert acc_metric(ex, pred) == 1.0
-    
+
     def test_acc_metric_incorrect(self):
         """Test accuracy metric with incorrect prediction."""
-        ex = dspy.Example(decision="allow")
+        ex = SimpleNamespace(decision="allow")
         pred = Mock(decision="deny")
         assert acc_metric(ex, pred) == 0.0
 
 class TestGepaMetric:
     def test_gepa_metric_correct(self):
         """Test GEPA metric with correct prediction."""
-        gold = dspy.Example(decision="allow")
+        gold = SimpleNamespace(decision="allow")
         pred = Mock(decision="allow")
         result = gepa_metric(gold, pred)
         assert result['score'] == 1.0
-    
+
     def test_gepa_metric_incorrect(self):
         """Test GEPA metric with incorrect prediction."""
-        gold = dspy.Example(decision="allow")
+        gold = SimpleNamespace(decision="allow")
         pred = Mock(decision="deny")
         result = gepa_metric(gold, pred)
         assert result['score'] == 0.0
@@ -0,0 +1,35 @@
+"""Tests for cc_approver.paths module."""
+import pytest
+from pathlib import Path
+
+from cc_approver.paths import first_existing, resolve_compiled_candidate
+
+class TestFirstExisting:
+    def test_returns_first_hit(self, temp_dir):
+        """Test the first path that stats wins."""
+        present = temp_dir / "present.json"
+        present.touch()
+        result = first_existing([temp_dir / "missing.json", present])
+        assert result == present
+
+    def test_none_when_nothing_exists(self, temp_dir):
+        """Test None comes back for all-missing candidates."""
+        assert first_existing([temp_dir / "a", temp_dir / "b"]) is None
+
+class TestResolveCompiledCandidate:
+    def test_finds_gz_only_artifact(self, temp_dir):
+        """Test a pruned .gz sibling resolves when the raw JSON is gone."""
+        raw = temp_dir / "approver.compiled.json"
+        gz = Path(str(raw) + ".gz")
+        gz.touch()
+        cfg = {"compiledModelPath": str(raw)}
+        assert resolve_compiled_candidate(str(temp_dir), cfg) == str(gz)
+
+    def test_prefers_gz_over_raw(self, temp_dir):
+        """Test the .gz sibling wins, matching try_load_compiled's order."""
+        raw = temp_dir / "approver.compiled.json"
+        raw.touch()
+        gz = Path(str(raw) + ".gz")
+        gz.touch()
+        cfg = {"compiledModelPath": str(raw)}
+        assert resolve_compiled_candidate(str(temp_dir), cfg) == str(gz)
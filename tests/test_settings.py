@@ -11,42 +11,40 @@ from cc_approver.settings import (
 )
 
 class TestSettingsPaths:
-    def test_settings_paths_default(self):
-        """Test settings_paths with default project directory."""
-        paths = settings_paths()
+    @pytest.mark.parametrize("proj,checks", [
+        (None, [".claude/settings.local.json", ".claude/settings.json", None]),
+        ("/custom/dir", ["/custom/dir/.claude/settings.local.json",
+                         "/custom/dir/.claude/settings.json", None]),
+    ], ids=["default", "custom-dir"])
+    def test_settings_paths(self, proj, checks):
+        """Test settings_paths for default and custom project directories."""
+        paths = settings_paths() if proj is None else settings_paths(proj)
         assert len(paths) == 3
-        assert ".claude/settings.local.json" in str(paths[0])
-        assert ".claude/settings.json" in str(paths[1])
-        assert str(Path.home()) in str(paths[2])
-    
-    def test_settings_paths_custom_dir(self):
-        """Test settings_paths with custom project directory."""
-        paths = settings_paths("/custom/dir")
-        assert "/custom/dir/.claude/settings.local.json" == str(paths[0])
-        assert "/custom/dir/.claude/settings.json" == str(paths[1])
+        for path, expected in zip(paths, checks):
+            if expected is None:
+                assert str(Path.home()) in str(path)
+            else:
+                assert expected in str(path)
 
 class TestEnsurePolicyText:
-    def test_ensure_policy_text_empty(self):
-        """Test ensure_policy_text with empty settings."""
-        settings = {}
-        result = ensure_policy_text(settings, "Default policy")
-        assert result["policy"]["approverInstructions"] == "Default policy"
-    
-    def test_ensure_policy_text_existing(self):
-        """Test ensure_policy_text preserves existing text."""
-        settings = {"policy": {"approverInstructions": "Existing"}}
-        result = ensure_policy_text(settings)
-        assert result["policy"]["approverInstructions"] == "Existing"
+    @pytest.mark.parametrize("settings,default,expected", [
+        ({}, "Default policy", "Default policy"),
+        ({"policy": {"approverInstructions": "Existing"}}, None, "Existing"),
+    ], ids=["empty", "existing-preserved"])
+    def test_ensure_policy_text(self, settings, default, expected):
+        """Test ensure_policy_text fills empty settings and preserves text."""
+        result = (ensure_policy_text(settings) if default is None
+                  else ensure_policy_text(settings, default))
+        assert result["policy"]["approverInstructions"] == expected
 
 class TestGetPolicyText:
-    def test_get_policy_text_exists(self):
-        """Test get_policy_text with existing policy."""
-        settings = {"policy": {"approverInstructions": "Test policy"}}
-        assert get_policy_text(settings) == "Test policy"
-    
-    def test_get_policy_text_missing(self):
-        """Test get_policy_text with missing policy."""
-        assert get_policy_text({}) == ""
+    @pytest.mark.parametrize("settings,expected", [
+        ({"policy": {"approverInstructions": "Test policy"}}, "Test policy"),
+        ({}, ""),
+    ], ids=["exists", "missing"])
+    def test_get_policy_text(self, settings, expected):
+        """Test get_policy_text with and without a policy."""
+        assert get_policy_text(settings) == expected
 
 class TestMergePreToolUseHook:
     def test_merge_hook_new(self):
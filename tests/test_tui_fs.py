@@ -0,0 +1,35 @@
+"""Filesystem-bound TUI tests (scope detection against real dirs)."""
+import pytest
+import uuid
+
+from cc_approver.tui import detect_scope_default
+
+pytestmark = pytest.mark.fs
+
+# Override conftest's temp_dir for this file: one session root with a
+# unique subdir per test beats a full mkdtemp+cleanup cycle each time
+# (pytest removes the session root itself).
+@pytest.fixture(scope="session")
+def _tmp_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("tui")
+
+@pytest.fixture
+def temp_dir(_tmp_root):
+    path = _tmp_root / uuid.uuid4().hex
+    path.mkdir()
+    return path
+
+class TestDetectScopeDefault:
+    @pytest.mark.parametrize("make_claude,expected", [
+        (True, "project"),
+        (False, "global"),
+    ], ids=["project-settings", "global-default"])
+    def test_detect_scope(self, temp_dir, monkeypatch, make_claude, expected):
+        """Scope is project iff .claude exists under the effective cwd."""
+        if make_claude:
+            # Detection stats the .claude dir itself, so one mkdir is
+            # all the setup this needs.
+            (temp_dir / ".claude").mkdir()
+        monkeypatch.delenv("CLAUDE_PROJECT_DIR", raising=False)
+        monkeypatch.chdir(temp_dir)
+        assert detect_scope_default() == expected
@@ -0,0 +1,34 @@
+"""Pure-mock TUI menu tests (no filesystem access)."""
+import pytest
+from unittest.mock import Mock
+
+from cc_approver import tui as _tui_mod
+from cc_approver.tui import main_menu
+
+pytestmark = pytest.mark.cpu
+
+def mk_select(*answers):
+    """Prompt mock whose ask() returns the given answers in order."""
+    m = Mock()
+    m.return_value.ask.side_effect = list(answers)
+    return m
+
+class TestMainMenu:
+    # monkeypatch.setattr on the pre-bound module object with a plain
+    # Mock: no _patch enter/exit stack or dotted-target parse per test.
+    @pytest.mark.parametrize("choice", ["Init", "Optimize", "Exit"])
+    def test_main_menu_passthrough(self, monkeypatch, choice):
+        """main_menu returns whichever option the prompt yields."""
+        mock_select = mk_select(choice)
+        monkeypatch.setattr(_tui_mod.q, 'select', mock_select)
+        assert main_menu() == choice
+        assert mock_select.call_count == 1
+
+    def test_main_menu_choices_shared(self, monkeypatch):
+        """Repeated calls reuse the module-level choices list."""
+        mock_select = mk_select("Exit", "Exit")
+        monkeypatch.setattr(_tui_mod.q, 'select', mock_select)
+        main_menu()
+        main_menu()
+        first, second = (c.kwargs['choices'] for c in mock_select.call_args_list)
+        assert first is second